@@ -6,12 +6,18 @@ API配置管理器
 
 import json
 import os
+import re
+import socket
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import logging
 
+from novel_generator.utils.file_handler import atomic_write_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,8 +117,6 @@ class APIManager:
 
     def _generate_id(self, name: str) -> str:
         """根据名称生成配置ID"""
-        import re
-
         # 转换为小写，替换空格为连字符，移除特殊字符
         config_id = re.sub(r'[^\w\s-]', '', name.lower())
         config_id = re.sub(r'[-\s]+', '-', config_id)
@@ -333,8 +337,9 @@ class APIManager:
         """保存配置到文件"""
         try:
             config_path = self._get_config_path(config.id)
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(config.to_dict(), f, ensure_ascii=False, indent=2)
+            atomic_write_text(
+                config_path, json.dumps(config.to_dict(), ensure_ascii=False, indent=2)
+            )
             return True
         except Exception as e:
             logger.error(f"保存配置失败: {e}")
@@ -366,8 +371,9 @@ class APIManager:
 
                     if data.get("is_default"):
                         data["is_default"] = False
-                        with open(other_config_file, "w", encoding="utf-8") as f:
-                            json.dump(data, f, ensure_ascii=False, indent=2)
+                        atomic_write_text(
+                            other_config_file, json.dumps(data, ensure_ascii=False, indent=2)
+                        )
                 except Exception as e:
                     logger.warning(f"更新其他配置默认状态失败: {e}")
 
@@ -440,8 +446,6 @@ class APIManager:
                 "latency_ms": 0,
             }
 
-        import time
-
         start_time = time.time()
 
         try:
@@ -546,9 +550,6 @@ class APIManager:
     def _test_socket_connection(self, url: str) -> Dict[str, str]:
         """使用socket进行基础连接测试（当requests不可用时）"""
         try:
-            import socket
-            from urllib.parse import urlparse
-
             parsed = urlparse(url)
             host = parsed.hostname or ""
             port = parsed.port or (443 if parsed.scheme == "https" else 80)
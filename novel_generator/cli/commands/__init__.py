@@ -1,15 +1,45 @@
 """
 CLI 命令模块
+
+各命令的 run 函数按需导入，避免启动时加载全部命令依赖（openai 等）
 """
 
-from novel_generator.cli.commands.outline import run as outline
-from novel_generator.cli.commands.expand import run as expand
-from novel_generator.cli.commands.status import run as status
-from novel_generator.cli.commands.continue_cmd import run as continue_write
-from novel_generator.cli.commands.settings_cmd import run as settings
-from novel_generator.cli.commands.touch import run as touch
-from novel_generator.cli.commands.regenerate import run as regenerate
-from novel_generator.cli.commands.api_commands import run as api
-from novel_generator.cli.commands.novel_commands import run as novel
+import importlib
+
+_COMMANDS = {
+    'outline': 'novel_generator.cli.commands.outline',
+    'expand': 'novel_generator.cli.commands.expand',
+    'status': 'novel_generator.cli.commands.status',
+    'continue_write': 'novel_generator.cli.commands.continue_cmd',
+    'settings': 'novel_generator.cli.commands.settings_cmd',
+    'touch': 'novel_generator.cli.commands.touch',
+    'regenerate': 'novel_generator.cli.commands.regenerate',
+    'api': 'novel_generator.cli.commands.api_commands',
+    'novel': 'novel_generator.cli.commands.novel_commands',
+}
+
+
+def _load_command(name):
+    """导入命令模块并返回其 run 函数"""
+    return importlib.import_module(_COMMANDS[name]).run
+
+
+def __getattr__(name):
+    if name not in _COMMANDS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _load_command(name)
+
+
+def lazy_command(name):
+    """返回延迟导入的命令函数（首次调用时才导入对应模块）"""
+    if name not in _COMMANDS:
+        raise ValueError(f"未知命令: {name}")
+
+    def _run(args):
+        return _load_command(name)(args)
+
+    _run.__name__ = name
+    return _run
+
 
 __all__ = ['outline', 'expand', 'status', 'continue_write', 'settings', 'touch', 'regenerate', 'api', 'novel']
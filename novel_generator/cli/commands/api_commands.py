@@ -7,11 +7,13 @@ API配置管理命令
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))  # noqa: E402
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))  # noqa: E402
 
 from novel_generator.cli.utils import (  # noqa: E402
     print_success,
@@ -38,6 +40,12 @@ DEFAULT_MODELS = {
     "deepseek": "deepseek-chat",
 }
 
+# 交互式配置只询问一个模型名，统一填入以下各项
+MODEL_KEYS = ("expansion_model", "outline_model")
+
+# 批量测试连接时的最大并发数（各请求均为网络等待，互不依赖）
+MAX_TEST_WORKERS = 8
+
 
 def _get_config_manager(project_root: str = ".") -> ConfigManager:
     """获取配置管理器实例"""
@@ -133,6 +141,12 @@ def _test_api_connection(provider: str, api_key: str, api_url: str, model: str)
         return False, f"测试失败: {str(e)}"
 
 
+def _invalidate_clients() -> None:
+    """API配置变更后清空已缓存的模型客户端"""
+    from novel_generator.utils.multi_model_client import clear_client_cache
+    clear_client_cache()
+
+
 def api_list(args: argparse.Namespace) -> int:
     """列出所有API配置"""
     project_root = Path.cwd()
@@ -226,15 +240,13 @@ def api_create(args: argparse.Namespace) -> int:
             "provider": provider,
             "api_key": api_key,
             "api_base_url": api_url,
-            "models": {
-                "expansion_model": model,
-                "outline_model": model,
-            },
+            "models": dict.fromkeys(MODEL_KEYS, model),
         }
 
         api_config = api_manager.create_config(config_data)
 
         if api_config:
+            _invalidate_clients()
             print_success(f"\n配置 '{name}' 创建成功")
             print_info(f"  服务商: {provider_name}")
             print_info(f"  模型: {model}")
@@ -269,6 +281,7 @@ def api_use(args: argparse.Namespace) -> int:
 
     # 设置为默认
     if api_manager.set_default(config_id):
+        _invalidate_clients()
         print_success(f"已将 '{config.name}' 设为默认API配置")
     else:
         print_error(f"设置默认配置失败: {config_id}")
@@ -312,17 +325,25 @@ def api_test(args: argparse.Namespace) -> int:
             return 0
 
         print_info("测试所有API配置...")
-        for config in configs:
-            success, message = _test_api_connection(
-                config.provider,
-                config.api_key,
-                config.api_base_url,
-                config.models.get("expansion_model", DEFAULT_MODELS.get(config.provider, "")),
-            )
-            if success:
-                print_success(f"[{config.name}] {message}")
-            else:
-                print_error(f"[{config.name}] {message}")
+        # 并发测试，按完成顺序输出结果
+        with ThreadPoolExecutor(max_workers=min(len(configs), MAX_TEST_WORKERS)) as executor:
+            futures = {
+                executor.submit(
+                    _test_api_connection,
+                    config.provider,
+                    config.api_key,
+                    config.api_base_url,
+                    config.models.get("expansion_model", DEFAULT_MODELS.get(config.provider, "")),
+                ): config
+                for config in configs
+            }
+            for future in as_completed(futures):
+                config = futures[future]
+                success, message = future.result()
+                if success:
+                    print_success(f"[{config.name}] {message}")
+                else:
+                    print_error(f"[{config.name}] {message}")
 
     return 0
 
@@ -349,6 +370,7 @@ def api_delete(args: argparse.Namespace) -> int:
 
     # 执行删除
     if api_manager.delete_config(config_id):
+        _invalidate_clients()
         print_success(f"已删除API配置: {config.name}")
     else:
         print_error(f"删除配置失败: {config_id}")
@@ -437,6 +459,14 @@ def api_edit(args: argparse.Namespace) -> int:
     else:
         print_success(f"连接测试成功: {message}")
 
+    # 只改交互式询问的模型项；其他模型键保持原值，未改模型时原有配置也不变
+    models = dict(config.models or {})
+    if model != current_model:
+        models.update(dict.fromkeys(MODEL_KEYS, model))
+    else:
+        for key in MODEL_KEYS:
+            models.setdefault(key, model)
+
     # 保存配置
     config_data = {
         "id": config_id,
@@ -444,14 +474,12 @@ def api_edit(args: argparse.Namespace) -> int:
         "provider": config.provider,
         "api_key": api_key,
         "api_base_url": api_url,
-        "models": {
-            "expansion_model": model,
-            "outline_model": model,
-        },
+        "models": models,
         "is_default": config.is_default,
     }
 
     if api_manager.update_config(config_id, config_data):
+        _invalidate_clients()
         print_success(f"\n'{name}' 配置已更新")
         return 0
     else:
@@ -7,37 +7,119 @@
 import argparse
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from novel_generator.core.chapter_expander import (
     ChapterExpander,
     _build_outline_context,
     _build_draft_context,
 )
-from novel_generator.utils.multi_model_client import MultiModelClient
+from novel_generator.utils.multi_model_client import get_multi_model_client
 from novel_generator.utils.common import (
-    load_style_guide, load_yaml_file,
+    load_style_guide, load_outline_file,
     get_project_root, get_latest_outline_file,
-    get_chapter_data, ensure_directories
+    get_chapter_data, build_chapter_key_index, ensure_directories, ensure_dir
 )
 from novel_generator.cli.utils import (
     print_success, print_error, print_info, print_warning,
-    setup_cli_logging, get_config_manager
+    setup_cli_logging, get_config_manager, print_failed_chapters,
+    StreamProgress, BATCH_SPOOL_NAME,
 )
 from novel_generator.core.ai_roles import AIRole
 
 
+def _continue_in_batches(
+    expander: ChapterExpander,
+    config_manager,
+    chapters: List[int],
+    outline_data: Dict[str, Any],
+    outline_file: str,
+    draft_dir: Path,
+    batch_size: int,
+    outline_window: int,
+    draft_window: int,
+) -> Tuple[int, List[int]]:
+    """
+    批量续写：每次请求生成一批章节，全部保存后一次性写入进度
+
+    流式接收时每章分隔符一到就先落盘，后续批次失败也保留已完成的章节。
+
+    Returns:
+        Tuple[int, List[int]]: (成功章数, 失败章节列表)
+    """
+    progress = StreamProgress("批量生成", spool_path=draft_dir / BATCH_SPOOL_NAME)
+    expander.stream_callback = progress
+    streamed: Dict[int, str] = {}
+
+    def _save_streamed(ch_num: int, content: str) -> None:
+        expander.save_chapter(ch_num, content, draft_dir)
+        streamed[ch_num] = content
+
+    expander.chapter_callback = _save_streamed
+    failed = False
+    try:
+        try:
+            results = expander.expand_range(
+                chapters[0], chapters[-1], outline_data, batch_size=batch_size,
+                draft_dir=str(draft_dir), outline_window=outline_window,
+                draft_window=draft_window,
+            )
+        finally:
+            progress.finish()
+            expander.chapter_callback = None
+    except Exception as e:
+        print_error(f"批量生成失败: {e}")
+        if progress.spool_path.exists():
+            print_info(f"已接收的部分正文保存在: {progress.spool_path}")
+        results = {}
+        failed = True
+
+    # 流式阶段已落盘且内容未变的章节不再重复写入
+    unsaved = {ch: text for ch, text in results.items() if streamed.get(ch) != text}
+    save_errors = expander.save_chapters(unsaved, draft_dir)
+    finished = {**streamed, **results}
+
+    saved_chapters = []
+    for ch_num in sorted(finished):
+        error = save_errors.get(ch_num)
+        if error is None:
+            saved_chapters.append(ch_num)
+            print_success(f"第 {ch_num} 章扩写完成 ({len(finished[ch_num])}字)")
+        else:
+            print_error(f"保存第 {ch_num} 章失败: {error}")
+
+    if saved_chapters:
+        config_manager.update_progress(
+            "draft", chapters[0], max(saved_chapters), outline_file,
+            clean_chapters=saved_chapters,
+        )
+    if failed:
+        saved = set(saved_chapters)
+        return len(saved_chapters), [ch for ch in chapters if ch not in saved]
+    progress.discard_spool()
+
+    stats = expander.get_batch_stats()
+    print_info(f"批量生成统计: 总批次数={stats['total_batches']}, 总章节数={stats['total_chapters']}")
+
+    saved = set(saved_chapters)
+    return len(saved_chapters), [ch for ch in chapters if ch not in saved]
+
+
 def run(args: argparse.Namespace) -> int:
     logger = setup_cli_logging()
 
     config_manager = get_config_manager(novel_id=getattr(args, 'novel_id', None))
     gen_config = config_manager.get_generation_config()
 
+    # state.json 在生成开始前只读一次，后续判断都复用
+    state = config_manager.state
+
     # 检查是否有 dirty 章节
-    first_dirty = config_manager.get_first_dirty_chapter()
+    first_dirty = config_manager.get_first_dirty_chapter(state)
     if first_dirty > 0 and args.cascade:
         start_chapter = first_dirty
         print_info(f"级联模式: 从第 {first_dirty} 章（dirty）开始重生成")
@@ -48,10 +130,10 @@ def run(args: argparse.Namespace) -> int:
         if start_from_dirty in ('', 'y', 'yes'):
             start_chapter = first_dirty
         else:
-            continue_info = config_manager.get_continue_info("draft")
+            continue_info = config_manager.get_continue_info("draft", state)
             start_chapter = continue_info["next_chapter"]
     else:
-        continue_info = config_manager.get_continue_info("draft")
+        continue_info = config_manager.get_continue_info("draft", state)
 
         if not continue_info["can_continue"] and continue_info["last_chapter"] == 0:
             print_error("没有找到已生成的章节，请先运行 'soundnovel expand' 生成初始章节")
@@ -59,8 +141,6 @@ def run(args: argparse.Namespace) -> int:
 
         start_chapter = continue_info["next_chapter"]
 
-    # Get state dict
-    state = config_manager.state
     total_chapters = state.get("total_chapters", 0)
 
     if args.end:
@@ -80,10 +160,11 @@ def run(args: argparse.Namespace) -> int:
     if args.dry_run:
         print_info("=== 干运行模式 ===")
         print_info(f"将生成章节: 第{start_chapter}章 - 第{end_chapter}章 ({len(chapters_to_generate)}章)")
-        dirty_list = [ch for ch in chapters_to_generate if config_manager.get_chapter_state(ch) == "dirty"]
+        chapter_states = state.get("chapter_states", {})
+        dirty_list = [ch for ch in chapters_to_generate if chapter_states.get(str(ch)) == "dirty"]
         if dirty_list:
             print_warning(f"其中 dirty 章节: {dirty_list}")
-        state_summary = config_manager.get_chapter_states_summary()
+        state_summary = config_manager.get_chapter_states_summary(state)
         print_info(f"章节状态统计: clean={state_summary['clean']}, dirty={state_summary['dirty']}, cosmetic={state_summary['cosmetic']}")
         return 0
 
@@ -93,7 +174,6 @@ def run(args: argparse.Namespace) -> int:
     config = config_manager.get_api_config()
 
     # Get outline file from state
-    state = config_manager.state
     outline_file = state.get("outline_file", "")
     if not outline_file:
         outline_file = get_latest_outline_file()
@@ -104,12 +184,12 @@ def run(args: argparse.Namespace) -> int:
 
     print_info(f"使用大纲文件: {outline_file}")
 
-    outline_data = load_yaml_file(Path(outline_file))
+    outline_data = load_outline_file(Path(outline_file))
     if not outline_data:
         print_error("大纲文件为空")
         return 1
 
-    client = MultiModelClient(config)
+    client = get_multi_model_client(config)
 
     from novel_generator.utils.common import load_core_setting
     core_setting = load_core_setting()
@@ -129,46 +209,70 @@ def run(args: argparse.Namespace) -> int:
     # Use novel paths
     novel_paths = config_manager.get_novel_paths()
     draft_dir = novel_paths["draft_dir"]
-    draft_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(draft_dir)
 
     success_count = 0
     fail_count = 0
 
-    for i, ch_num in enumerate(chapters_to_generate, 1):
-        print()
-        print_info(f"[{i}/{len(chapters_to_generate)}] 正在扩写第 {ch_num} 章...")
-
-        try:
-            ch_data = get_chapter_data(outline_data, ch_num)
-            if not ch_data:
-                print_error(f"大纲中找不到第 {ch_num} 章的数据")
+    # 多章续写时合并为批量请求，摊薄每次调用重复发送的系统提示与设定
+    use_batch = len(chapters_to_generate) > 1 and not args.single
+    if use_batch:
+        batch_size = args.batch_size or gen_config.get("batch_size", 10)
+        print_info(f"启用批量生成模式，批次大小: {batch_size}")
+        success_count, failed_chapters = _continue_in_batches(
+            expander, config_manager, chapters_to_generate, outline_data,
+            str(outline_file), draft_dir, batch_size, outline_window, draft_window,
+        )
+        fail_count = len(failed_chapters)
+    else:
+        outline_blocks = {}
+        draft_texts = {}
+        failed_chapters = []
+        chapter_keys = build_chapter_key_index(outline_data)
+        for i, ch_num in enumerate(chapters_to_generate, 1):
+            print()
+            print_info(f"[{i}/{len(chapters_to_generate)}] 正在扩写第 {ch_num} 章...")
+
+            try:
+                ch_data = get_chapter_data(outline_data, ch_num, chapter_keys)
+                if not ch_data:
+                    print_error(f"大纲中找不到第 {ch_num} 章的数据")
+                    failed_chapters.append(ch_num)
+                    fail_count += 1
+                    continue
+
+                outline_ctx = _build_outline_context(
+                    outline_data, ch_num, outline_window, block_cache=outline_blocks
+                )
+                draft_ctx = _build_draft_context(
+                    draft_dir, ch_num, draft_window, text_cache=draft_texts
+                )
+
+                content = expander.expand_chapter(
+                    chapter_num=ch_num,
+                    chapter_outline=ch_data,
+                    outline_context=outline_ctx,
+                    draft_context=draft_ctx,
+                )
+
+                expander.save_chapter(ch_num, content, draft_dir)
+                draft_texts[ch_num] = content
+
+                config_manager.update_progress(
+                    "draft", start_chapter, ch_num, str(outline_file), clean_chapters=(ch_num,)
+                )
+
+                print_success(f"第 {ch_num} 章扩写完成 ({len(content)}字)")
+                success_count += 1
+
+            except Exception as e:
+                print_error(f"扩写第 {ch_num} 章失败: {e}")
+                # 堆栈延迟到日志格式化时才生成（DEBUG 级别才输出）
+                logger.debug("扩写第 %d 章失败", ch_num, exc_info=True)
+                failed_chapters.append(ch_num)
                 fail_count += 1
                 continue
 
-            outline_ctx = _build_outline_context(outline_data, ch_num, outline_window)
-            draft_ctx = _build_draft_context(draft_dir, ch_num, draft_window)
-
-            content = expander.expand_chapter(
-                chapter_num=ch_num,
-                chapter_outline=ch_data,
-                outline_context=outline_ctx,
-                draft_context=draft_ctx,
-            )
-
-            expander.save_chapter(ch_num, content, draft_dir)
-
-            config_manager.set_chapter_state(ch_num, "clean")
-
-            config_manager.update_progress("draft", start_chapter, ch_num, str(outline_file))
-
-            print_success(f"第 {ch_num} 章扩写完成 ({len(content)}字)")
-            success_count += 1
-
-        except Exception as e:
-            print_error(f"扩写第 {ch_num} 章失败: {e}")
-            fail_count += 1
-            continue
-
     # 获取实际使用的 role_config
     role_config = expander.ai_role_manager.get_role_config(AIRole.GENERATOR)
     model_info = f"{role_config.provider}/{role_config.model}" if role_config.model else role_config.provider
@@ -187,6 +291,7 @@ def run(args: argparse.Namespace) -> int:
     print_info(f"成功: {success_count} 章")
     if fail_count > 0:
         print_warning(f"失败: {fail_count} 章")
+        print_failed_chapters(failed_chapters)
     print_info(f"草稿位置: {draft_dir}")
 
     new_info = config_manager.get_continue_info("draft")
@@ -11,7 +11,8 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from novel_generator.core.chapter_expander import (
     ChapterExpander,
@@ -20,17 +21,19 @@ from novel_generator.core.chapter_expander import (
 )
 from novel_generator.config.settings import Settings
 from novel_generator.config.config_manager import ConfigManager
-from novel_generator.utils.multi_model_client import MultiModelClient
+from novel_generator.utils.multi_model_client import get_multi_model_client
 from novel_generator.utils.common import (
     load_config,
     load_style_guide,
-    load_yaml_file,
+    load_outline_file,
     get_project_root,
     get_latest_outline_file,
     parse_chapter_range,
     format_chapter_key,
     get_chapter_data,
+    build_chapter_key_index,
     ensure_directories,
+    ensure_dir,
 )
 from novel_generator.cli.utils import (
     print_success,
@@ -39,6 +42,9 @@ from novel_generator.cli.utils import (
     print_warning,
     setup_cli_logging,
     get_config_manager,
+    StreamProgress,
+    BATCH_SPOOL_NAME,
+    print_failed_chapters,
 )
 from novel_generator.core.ai_roles import AIRole
 
@@ -99,7 +105,7 @@ def run(args: argparse.Namespace) -> int:
 
         print_info(f"使用大纲文件: {outline_file}")
 
-        outline_data = load_yaml_file(outline_file)
+        outline_data = load_outline_file(outline_file)
         if not outline_data:
             print_error("大纲文件为空")
             return 1
@@ -159,7 +165,7 @@ def run(args: argparse.Namespace) -> int:
             f"将扩写 {len(chapters_to_expand)} 个章节: {chapters_to_expand[0]}-{chapters_to_expand[-1]}"
         )
 
-        client = MultiModelClient(config)
+        client = get_multi_model_client(config)
 
         from novel_generator.utils.common import load_core_setting
         core_setting = load_core_setting()
@@ -187,7 +193,7 @@ def run(args: argparse.Namespace) -> int:
         # Use novel's draft path instead of old config path
         novel_paths = config_manager.get_novel_paths()
         draft_dir = novel_paths["draft_dir"]
-        draft_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(draft_dir)
 
         success_count = 0
         fail_count = 0
@@ -199,65 +205,112 @@ def run(args: argparse.Namespace) -> int:
             # 批量生成模式
             batch_size = args.batch_size or gen_config.get("batch_size", 10)
 
+            progress = StreamProgress("批量生成", spool_path=draft_dir / BATCH_SPOOL_NAME)
+            expander.stream_callback = progress
+            # 流式接收时每章分隔符一到就先落盘，后续批次失败也保留已完成的章节
+            streamed = {}
+
+            def _save_streamed(ch_num: int, content: str) -> None:
+                expander.save_chapter(ch_num, content, draft_dir)
+                streamed[ch_num] = content
+
+            expander.chapter_callback = _save_streamed
+            batch_failed = False
             try:
-                results = expander.expand_range(
-                    chapters_to_expand[0],
-                    chapters_to_expand[-1],
-                    outline_data,
-                    batch_size=batch_size,
+                try:
+                    results = expander.expand_range(
+                        chapters_to_expand[0],
+                        chapters_to_expand[-1],
+                        outline_data,
+                        batch_size=batch_size,
+                        draft_dir=str(draft_dir),
+                        outline_window=outline_window,
+                        draft_window=draft_window,
+                    )
+                finally:
+                    progress.finish()
+                    expander.chapter_callback = None
+            except Exception as e:
+                print_error(f"批量生成失败: {e}")
+                if progress.spool_path.exists():
+                    print_info(f"已接收的部分正文保存在: {progress.spool_path}")
+                results = {}
+                batch_failed = True
+
+            # 保存结果（流式阶段已落盘且内容未变的不再重复写入），状态与进度在全部保存后一次性写入
+            unsaved = {ch: text for ch, text in results.items() if streamed.get(ch) != text}
+            save_errors = expander.save_chapters(unsaved, draft_dir)
+            finished = {**streamed, **results}
+
+            saved_chapters = []
+            for ch_num in sorted(finished):
+                error = save_errors.get(ch_num)
+                if error is None:
+                    saved_chapters.append(ch_num)
+                    print_success(f"第 {ch_num} 章扩写完成 ({len(finished[ch_num])}字)")
+                    success_count += 1
+                else:
+                    print_error(f"保存第 {ch_num} 章失败: {error}")
+
+            if saved_chapters:
+                config_manager.update_progress(
+                    "draft", actual_start, max(saved_chapters), str(outline_file),
+                    clean_chapters=saved_chapters,
                 )
+            saved = set(saved_chapters)
+            failed_chapters = [ch for ch in chapters_to_expand if ch not in saved]
+            fail_count = len(failed_chapters)
 
-                # 保存结果并更新状态
-                for ch_num, content in results.items():
-                    try:
-                        expander.save_chapter(ch_num, content, draft_dir)
-                        config_manager.set_chapter_state(ch_num, "clean")
-                        config_manager.update_progress(
-                            "draft", actual_start, ch_num, str(outline_file)
-                        )
-                        print_success(f"第 {ch_num} 章扩写完成 ({len(content)}字)")
-                        success_count += 1
-                    except Exception as e:
-                        print_error(f"保存第 {ch_num} 章失败: {e}")
-                        fail_count += 1
+            if not batch_failed:
+                progress.discard_spool()
 
                 # 显示批量统计
                 stats = expander.get_batch_stats()
                 print_info(f"批量生成统计: 总批次数={stats['total_batches']}, 总章节数={stats['total_chapters']}")
-
-            except Exception as e:
-                print_error(f"批量生成失败: {e}")
-                fail_count = len(chapters_to_expand)
         else:
             # 单章生成模式（原有逻辑）
+            outline_blocks = {}
+            draft_texts = {}
+            failed_chapters = []
+            chapter_keys = build_chapter_key_index(outline_data)
             for i, ch_num in enumerate(chapters_to_expand, 1):
                 print()
                 print_info(f"[{i}/{len(chapters_to_expand)}] 正在扩写第 {ch_num} 章...")
 
                 try:
-                    ch_data = get_chapter_data(outline_data, ch_num)
+                    ch_data = get_chapter_data(outline_data, ch_num, chapter_keys)
                     if not ch_data:
                         print_error(f"大纲中找不到第 {ch_num} 章的数据")
+                        failed_chapters.append(ch_num)
                         fail_count += 1
                         continue
 
-                    outline_ctx = _build_outline_context(outline_data, ch_num, outline_window)
-                    draft_ctx = _build_draft_context(draft_dir, ch_num, draft_window)
-
-                    content = expander.expand_chapter(
-                        chapter_num=ch_num,
-                        chapter_outline=ch_data,
-                        outline_context=outline_ctx,
-                        draft_context=draft_ctx,
+                    outline_ctx = _build_outline_context(
+                        outline_data, ch_num, outline_window, block_cache=outline_blocks
+                    )
+                    draft_ctx = _build_draft_context(
+                        draft_dir, ch_num, draft_window, text_cache=draft_texts
                     )
 
-                    expander.save_chapter(ch_num, content, draft_dir)
+                    progress = StreamProgress(f"第 {ch_num} 章")
+                    expander.stream_callback = progress
+                    try:
+                        content = expander.expand_chapter(
+                            chapter_num=ch_num,
+                            chapter_outline=ch_data,
+                            outline_context=outline_ctx,
+                            draft_context=draft_ctx,
+                        )
+                    finally:
+                        progress.finish()
 
-                    # 标记章节为 clean
-                    config_manager.set_chapter_state(ch_num, "clean")
+                    expander.save_chapter(ch_num, content, draft_dir)
+                    draft_texts[ch_num] = content
 
+                    # 更新进度并标记章节为 clean
                     config_manager.update_progress(
-                        "draft", actual_start, ch_num, str(outline_file)
+                        "draft", actual_start, ch_num, str(outline_file),
+                        clean_chapters=(ch_num,),
                     )
 
                     print_success(f"第 {ch_num} 章扩写完成 ({len(content)}字)")
@@ -265,6 +318,9 @@ def run(args: argparse.Namespace) -> int:
 
                 except Exception as e:
                     print_error(f"扩写第 {ch_num} 章失败: {e}")
+                    # 堆栈延迟到日志格式化时才生成（DEBUG 级别才输出）
+                    logger.debug("扩写第 %d 章失败", ch_num, exc_info=True)
+                    failed_chapters.append(ch_num)
                     fail_count += 1
                     continue
 
@@ -286,6 +342,7 @@ def run(args: argparse.Namespace) -> int:
         print_info(f"成功: {success_count} 章")
         if fail_count > 0:
             print_warning(f"失败: {fail_count} 章")
+            print_failed_chapters(failed_chapters)
         print_info(f"大纲窗口: {outline_window} | 正文窗口: {draft_window}")
         print_info(f"草稿位置: {draft_dir}")
         print_info("=" * 50)
@@ -5,6 +5,7 @@
 """
 
 import argparse
+import re
 import sys
 import json
 import zipfile
@@ -14,7 +15,8 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))  # noqa: E402
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))  # noqa: E402
 
 from novel_generator.cli.utils import (  # noqa: E402
     print_success,
@@ -25,6 +27,7 @@ from novel_generator.cli.utils import (  # noqa: E402
 )
 from novel_generator.config.config_manager import ConfigManager  # noqa: E402
 from novel_generator.novel_manager import NovelManager, NovelProject  # noqa: E402
+from novel_generator.utils.file_handler import atomic_write_text, json_dumps  # noqa: E402
 
 
 NOVELS_DIR = Path("novels")
@@ -58,6 +61,7 @@ def _get_novel_info(novel_dir: Path) -> Dict[str, Any]:
         "description": "",
         "created_at": "",
         "updated_at": "",
+        "api_config_ref": "",
     }
 
     # 从新架构的 config/novel.json 读取信息
@@ -70,6 +74,7 @@ def _get_novel_info(novel_dir: Path) -> Dict[str, Any]:
                 info["description"] = data.get("description", "")
                 info["created_at"] = data.get("created_at", "")
                 info["updated_at"] = data.get("updated_at", "")
+                info["api_config_ref"] = data.get("api_config_ref", "")
         except Exception:
             pass
     else:
@@ -144,7 +149,9 @@ def _list_novels_table(novels: List[Dict[str, Any]], current_id: Optional[str])
     for novel in novels:
         is_current = "✓" if novel["id"] == current_id else ""
         created_at = _format_datetime(novel.get("created_at", ""))
-        desc = novel.get("description", "")[:28] + "..." if len(novel.get("description", "")) > 30 else novel.get("description", "")
+        desc = novel.get("description", "")
+        if len(desc) > 30:
+            desc = desc[:28] + "..."
 
         table.add_row(
             novel["id"],
@@ -201,7 +208,6 @@ def novel_create(args: argparse.Namespace) -> int:
         return 1
 
     # 生成小说ID（使用小写字母和数字）
-    import re
     novel_id = re.sub(r'[^\w\s-]', '', name.lower())
     novel_id = re.sub(r'[-\s]+', '-', novel_id)
     novel_id = novel_id[:30]  # 限制长度
@@ -321,8 +327,7 @@ def novel_rename(args: argparse.Namespace) -> int:
             with open(session_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
             data["project_name"] = new_name
-            with open(session_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            atomic_write_text(session_file, json_dumps(data))
         except Exception as e:
             print_error(f"更新项目名称失败: {e}")
             return 1
@@ -334,8 +339,7 @@ def novel_rename(args: argparse.Namespace) -> int:
             with open(info_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
             data["name"] = new_name
-            with open(info_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            atomic_write_text(info_file, json_dumps(data))
         except Exception as e:
             print_error(f"更新小说信息失败: {e}")
             return 1
@@ -414,16 +418,8 @@ def novel_info(args: argparse.Namespace) -> int:
         except Exception:
             pass
 
-    # 从 config/novel.json 读取API配置引用
-    novel_config_file = novel_dir / "config" / "novel.json"
-    api_configured = False
-    if novel_config_file.exists():
-        try:
-            with open(novel_config_file, "r", encoding="utf-8") as f:
-                config_data = json.load(f)
-                api_configured = bool(config_data.get("api_config_ref", ""))
-        except Exception:
-            pass
+    # API配置引用已随 _get_novel_info 从 config/novel.json 读出
+    api_configured = bool(info["api_config_ref"])
 
     # 获取进度信息
     total_chapters = state_data.get("total_chapters", 0)
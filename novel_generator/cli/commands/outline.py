@@ -12,14 +12,15 @@ from typing import Optional
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 import json
 import yaml
 from novel_generator.core.outline_generator import OutlineGenerator
 from novel_generator.config.settings import Settings
 from novel_generator.utils.common import (
-    get_project_root, ensure_directories
+    get_project_root, ensure_directories, load_yaml_file
 )
 from novel_generator.cli.utils import (
     print_success, print_error, print_info, print_warning,
@@ -52,17 +53,8 @@ def run(args: argparse.Namespace) -> int:
         core_setting_path = paths["core_setting"]
         chapter_plan_path = paths.get("chapter_plan") or paths["source_dir"] / "chapter_plan.yaml"
 
-        if core_setting_path.exists():
-            with open(core_setting_path, "r", encoding="utf-8") as f:
-                core_setting = yaml.safe_load(f) or {}
-        else:
-            core_setting = {}
-
-        if chapter_plan_path.exists():
-            with open(chapter_plan_path, "r", encoding="utf-8") as f:
-                chapter_plan = yaml.safe_load(f) or {}
-        else:
-            chapter_plan = {}
+        core_setting = load_yaml_file(core_setting_path, default={})
+        chapter_plan = load_yaml_file(chapter_plan_path, default={})
 
         if not core_setting:
             print_error("核心设定为空，请先填写 source/core_setting.yaml")
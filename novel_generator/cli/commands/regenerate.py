@@ -9,22 +9,24 @@ import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from novel_generator.core.chapter_expander import (
     ChapterExpander,
     _build_outline_context,
     _build_draft_context,
 )
-from novel_generator.utils.multi_model_client import MultiModelClient
+from novel_generator.utils.multi_model_client import get_multi_model_client
 from novel_generator.utils.common import (
-    load_yaml_file,
+    load_outline_file,
     get_latest_outline_file,
     get_chapter_data,
+    build_chapter_key_index,
 )
 from novel_generator.cli.utils import (
     print_success, print_error, print_info, print_warning,
-    confirm_action, get_config_manager,
+    confirm_action, get_config_manager, print_failed_chapters, setup_cli_logging,
 )
 from novel_generator.core.ai_roles import AIRole
 
@@ -38,6 +40,7 @@ def _parse_chapter_range(range_str: str):
 
 
 def run(args: argparse.Namespace) -> int:
+    logger = setup_cli_logging()
     config_manager = get_config_manager(novel_id=getattr(args, 'novel_id', None))
 
     # 解析章节范围
@@ -51,6 +54,11 @@ def run(args: argparse.Namespace) -> int:
 
     # 正文重生成
     config = config_manager.get_api_config()
+    # 重生成必须重新请求，不复用响应缓存；只改副本，其他读取方仍能看到原配置
+    system_cfg = dict(config.get("system", {}))
+    api_cfg = dict(system_cfg.get("api", {}))
+    api_cfg.pop("response_cache_dir", None)
+    config = {**config, "system": {**system_cfg, "api": api_cfg}}
     gen_config = config_manager.get_generation_config()
     outline_window = gen_config.get("outline_window", 30)
     draft_window = gen_config.get("draft_window", 3)
@@ -65,7 +73,7 @@ def run(args: argparse.Namespace) -> int:
         print_error("未找到大纲文件")
         return 1
 
-    outline_data = load_yaml_file(Path(outline_file))
+    outline_data = load_outline_file(Path(outline_file))
     if not outline_data:
         print_error("大纲文件为空")
         return 1
@@ -93,13 +101,12 @@ def run(args: argparse.Namespace) -> int:
                 print_info(f"将级联重生成第{start_ch}-{end_ch}章")
             else:
                 print_info(f"仅重生成第{start_ch}-{end_ch}章，受影响章节将标记为 dirty")
-                for ch in existing_affected:
-                    config_manager.set_chapter_state(ch, "dirty")
+                config_manager.set_chapter_states(existing_affected, "dirty")
     else:
         print_info(f"重生成第{start_ch}-{end_ch}章（无后续章节受影响）")
 
     # 执行重生成
-    client = MultiModelClient(config)
+    client = get_multi_model_client(config)
 
     from novel_generator.utils.common import load_core_setting
     core_setting = load_core_setting()
@@ -117,19 +124,28 @@ def run(args: argparse.Namespace) -> int:
     fail_count = 0
     chapters_to_gen = list(range(start_ch, end_ch + 1))
 
+    outline_blocks = {}
+    draft_texts = {}
+    failed_chapters = []
+    chapter_keys = build_chapter_key_index(outline_data)
     for i, ch_num in enumerate(chapters_to_gen, 1):
         print()
         print_info(f"[{i}/{len(chapters_to_gen)}] 正在重生成第 {ch_num} 章...")
 
         try:
-            ch_data = get_chapter_data(outline_data, ch_num)
+            ch_data = get_chapter_data(outline_data, ch_num, chapter_keys)
             if not ch_data:
                 print_error(f"大纲中找不到第 {ch_num} 章的数据")
+                failed_chapters.append(ch_num)
                 fail_count += 1
                 continue
 
-            outline_ctx = _build_outline_context(outline_data, ch_num, outline_window)
-            draft_ctx = _build_draft_context(draft_dir, ch_num, draft_window)
+            outline_ctx = _build_outline_context(
+                outline_data, ch_num, outline_window, block_cache=outline_blocks
+            )
+            draft_ctx = _build_draft_context(
+                draft_dir, ch_num, draft_window, text_cache=draft_texts
+            )
 
             content = expander.expand_chapter(
                 chapter_num=ch_num,
@@ -139,6 +155,7 @@ def run(args: argparse.Namespace) -> int:
             )
 
             expander.save_chapter(ch_num, content, draft_dir)
+            draft_texts[ch_num] = content
             config_manager.set_chapter_state(ch_num, "clean")
 
             print_success(f"第 {ch_num} 章重生成完成 ({len(content)}字)")
@@ -146,6 +163,9 @@ def run(args: argparse.Namespace) -> int:
 
         except Exception as e:
             print_error(f"重生成第 {ch_num} 章失败: {e}")
+            # 堆栈延迟到日志格式化时才生成（DEBUG 级别才输出）
+            logger.debug("重生成第 %d 章失败", ch_num, exc_info=True)
+            failed_chapters.append(ch_num)
             fail_count += 1
             continue
 
@@ -164,6 +184,7 @@ def run(args: argparse.Namespace) -> int:
     print()
     print_info("=" * 50)
     print_info(f"重生成完成: 成功 {success_count} 章, 失败 {fail_count} 章")
+    print_failed_chapters(failed_chapters)
     print_info(f"大纲窗口: {outline_window} | 正文窗口: {draft_window}")
     print_info("=" * 50)
 
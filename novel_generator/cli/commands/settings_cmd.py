@@ -10,7 +10,8 @@ import json
 from typing import Optional
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from novel_generator.novel_manager import NovelManager
 from api.manager import APIManager
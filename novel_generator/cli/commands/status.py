@@ -5,6 +5,7 @@
 """
 
 import argparse
+from collections import Counter
 from pathlib import Path
 from typing import Optional
 
@@ -18,6 +19,11 @@ from novel_generator.cli.utils import (
     get_config_manager,
 )
 
+STATE_CHARS = {"clean": "C", "dirty": "D", "cosmetic": "O"}
+
+# 分页查看章节状态一览时的默认每页章节数（20行 x 10章）
+PAGE_SIZE = 200
+
 
 def run(args: argparse.Namespace) -> int:
     """运行状态命令"""
@@ -90,27 +96,41 @@ def run(args: argparse.Namespace) -> int:
         print()
         print_info("--- 章节状态 ---")
 
-        clean_count = sum(1 for v in chapter_states.values() if v == "clean")
-        dirty_count = sum(1 for v in chapter_states.values() if v == "dirty")
-        cosmetic_count = sum(1 for v in chapter_states.values() if v == "cosmetic")
+        counts = Counter(chapter_states.values())
 
         print(f"  已追踪: {len(chapter_states)} 章")
-        print(f"  [C]lean: {clean_count} | [D]irty: {dirty_count} | Cosmetic[O]: {cosmetic_count}")
-
-        # 按章节号排序显示
-        sorted_chapters = sorted(chapter_states.keys(), key=lambda x: int(x))
-        state_chars = {"clean": "C", "dirty": "D", "cosmetic": "O"}
+        print(
+            f"  [C]lean: {counts['clean']} | [D]irty: {counts['dirty']} | "
+            f"Cosmetic[O]: {counts['cosmetic']}"
+        )
 
-        # 每10章一行
-        if sorted_chapters:
+        # 按章节号排序，默认列出全部章节；指定 --page/--page-size 时只为当前页构建单元格；
+        # 每10章一行，整块一次性输出
+        sorted_chapters = sorted(chapter_states, key=int)
+        page_size = getattr(args, "page_size", None)
+        page = getattr(args, "page", None)
+        if page_size is None and page is not None:
+            page_size = PAGE_SIZE
+        if page_size is None:
+            total_pages = 1
+            visible = sorted_chapters
+        else:
+            page_size = max(1, page_size)
+            total_pages = (len(sorted_chapters) + page_size - 1) // page_size
+            page = min(max(1, page or 1), total_pages)
+            visible = sorted_chapters[(page - 1) * page_size:page * page_size]
+        cells = [
+            f"{ch}:{STATE_CHARS.get(chapter_states[ch], '?')}" for ch in visible
+        ]
+        rows = [
+            "  " + "  ".join(cells[row_start:row_start + 10])
+            for row_start in range(0, len(cells), 10)
+        ]
+        print()
+        print("\n".join(rows))
+        if total_pages > 1:
             print()
-            for row_start in range(0, len(sorted_chapters), 10):
-                row_chapters = sorted_chapters[row_start:row_start + 10]
-                row_parts = []
-                for ch in row_chapters:
-                    s = chapter_states.get(ch, "?")
-                    row_parts.append(f"{ch}:{state_chars.get(s, '?')}")
-                print(f"  {'  '.join(row_parts)}")
+            print_info(f"第 {page}/{total_pages} 页，使用 --page 查看其他页")
 
     print()
     print_info("=" * 50)
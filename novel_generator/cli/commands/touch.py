@@ -11,7 +11,8 @@ import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from novel_generator.cli.utils import (
     print_success, print_error, print_info, print_warning,
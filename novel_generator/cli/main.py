@@ -19,17 +19,11 @@ from pathlib import Path
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-from novel_generator.cli import commands
+from novel_generator.cli.commands import lazy_command
 from novel_generator.cli.utils import setup_cli_logging
-from novel_generator.cli.commands.api_commands import (
-    api_list, api_create, api_use, api_test, api_delete, api_edit
-)
-from novel_generator.cli.commands.novel_commands import (
-    novel_list, novel_create, novel_switch, novel_rename,
-    novel_delete, novel_info, novel_export, novel_import
-)
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -130,7 +124,7 @@ def create_parser() -> argparse.ArgumentParser:
         default=None,
         help='对话窗口大小（默认: 100章）'
     )
-    outline_parser.set_defaults(func=commands.outline)
+    outline_parser.set_defaults(func=lazy_command('outline'))
 
     # expand 命令
     expand_parser = subparsers.add_parser(
@@ -197,7 +191,7 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='强制使用单章模式（禁用批量优化，用于调试）'
     )
-    expand_parser.set_defaults(func=commands.expand)
+    expand_parser.set_defaults(func=lazy_command('expand'))
 
     # status 命令
     status_parser = subparsers.add_parser(
@@ -205,7 +199,19 @@ def create_parser() -> argparse.ArgumentParser:
         help='查看项目状态',
         description='显示当前项目的生成进度、配置状态和章节状态'
     )
-    status_parser.set_defaults(func=commands.status)
+    status_parser.add_argument(
+        '--page', '-p',
+        type=int,
+        default=None,
+        help='分页显示章节状态一览并查看指定页（默认列出全部章节）'
+    )
+    status_parser.add_argument(
+        '--page-size',
+        type=int,
+        default=None,
+        help='分页显示时每页的章节数（指定 --page 时默认: 200）'
+    )
+    status_parser.set_defaults(func=lazy_command('status'))
 
     # continue 命令
     continue_parser = subparsers.add_parser(
@@ -228,7 +234,18 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='仅显示将生成哪些章节，不实际执行'
     )
-    continue_parser.set_defaults(func=commands.continue_write)
+    continue_parser.add_argument(
+        '--batch-size', '-b',
+        type=int,
+        default=None,
+        help='批量生成时每批章节数（默认: 从配置读取，初始值 10）'
+    )
+    continue_parser.add_argument(
+        '--single',
+        action='store_true',
+        help='强制使用单章模式（禁用批量优化，用于调试）'
+    )
+    continue_parser.set_defaults(func=lazy_command('continue_write'))
 
     # touch 命令
     touch_parser = subparsers.add_parser(
@@ -254,7 +271,7 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='不触发级联dirty标记'
     )
-    touch_parser.set_defaults(func=commands.touch)
+    touch_parser.set_defaults(func=lazy_command('touch'))
 
     # regenerate 命令
     regenerate_parser = subparsers.add_parser(
@@ -282,7 +299,7 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='跳过确认，自动级联'
     )
-    regenerate_parser.set_defaults(func=commands.regenerate)
+    regenerate_parser.set_defaults(func=lazy_command('regenerate'))
 
     from novel_generator.cli.commands.settings_cmd import add_parser as add_settings_parser
     add_settings_parser(subparsers)
@@ -4,10 +4,28 @@ CLI 工具函数
 提供命令行特定的辅助功能
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+# 文件日志由后台线程写入，调用方只需入队，不会阻塞在磁盘写入上
+_file_log_listener: Optional[QueueListener] = None
+
+
+def _stop_file_log_listener() -> None:
+    """停止后台日志线程并写完队列中剩余的记录"""
+    global _file_log_listener
+    if _file_log_listener is not None:
+        _file_log_listener.stop()
+        _file_log_listener.handlers[0].close()
+        _file_log_listener = None
+
+
+atexit.register(_stop_file_log_listener)
 
 
 def setup_cli_logging(log_file: str = ".logs/cli.log") -> logging.Logger:
@@ -23,8 +41,9 @@ def setup_cli_logging(log_file: str = ".logs/cli.log") -> logging.Logger:
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
-    # 清除现有处理器
+    # 清除现有处理器（重复调用时先收尾上一次的文件日志线程）
     logger.handlers.clear()
+    _stop_file_log_listener()
 
     # 格式化器
     formatter = logging.Formatter(
@@ -37,15 +56,19 @@ def setup_cli_logging(log_file: str = ".logs/cli.log") -> logging.Logger:
         log_path = project_root / log_file
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 文件处理器
+        # 文件处理器：经队列交给后台线程写入
         file_handler = logging.FileHandler(log_path, encoding='utf-8')
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        global _file_log_listener
+        _file_log_listener = QueueListener(log_queue, file_handler)
+        _file_log_listener.start()
+        logger.addHandler(QueueHandler(log_queue))
     except Exception as e:
         # 如果无法创建日志文件，只使用控制台
         print(f"警告: 无法创建日志文件 {log_file}: {e}", file=sys.stderr)
 
-    # 控制台处理器
+    # 控制台处理器保持同步输出，与 print_* 提示的先后顺序一致
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
@@ -112,6 +135,106 @@ def print_info(message: str) -> None:
     _safe_print(f"[INFO] {message}")
 
 
+def print_failed_chapters(chapters: List[int]) -> None:
+    """循环结束后统一输出失败章节及重试提示"""
+    if not chapters:
+        return
+    listed = "、".join(str(ch) for ch in chapters)
+    print_warning(f"失败章节: {listed}")
+
+    # 每段连续章节给一条命令，避免重生成中间已成功的章节
+    runs: List[List[int]] = []
+    for ch in sorted(set(chapters)):
+        if runs and ch == runs[-1][-1] + 1:
+            runs[-1].append(ch)
+        else:
+            runs.append([ch])
+    commands = [
+        f"soundnovel regenerate --chapter {run[0]}" if len(run) == 1
+        else f"soundnovel regenerate --chapters {run[0]}-{run[-1]}"
+        for run in runs
+    ]
+    if len(commands) == 1:
+        print_info(f"可运行 '{commands[0]}' 重试")
+    else:
+        print_info("可运行以下命令重试:")
+        for command in commands:
+            print_info(f"  {command}")
+
+
+# 批量生成时流式内容的落盘文件名（位于草稿目录，生成成功后删除）
+BATCH_SPOOL_NAME = ".batch_stream.partial.txt"
+
+# 缓冲至少这么多字且遇到句末标点时写入落盘文件
+_SPOOL_FLUSH_CHARS = 450
+_SENTENCE_ENDS = ("。", "！", "？", "\n")
+
+
+class StreamProgress:
+    """流式生成进度：在同一行刷新已接收字数，可直接作为 on_delta 回调
+
+    指定 spool_path 时，按整句把已接收内容追加写入该文件，
+    生成中途失败也能保留已输出的正文。创建时先删除上次运行残留的落盘文件，
+    文件只包含本次运行的输出；落盘文件在首次写入时打开，
+    finish() 时关闭，期间每次写入后 flush 到系统缓冲区。
+    """
+
+    def __init__(self, label: str, step: int = 200, spool_path: Optional[Path] = None):
+        self.label = label
+        self.step = step
+        self.count = 0
+        self._next = step
+        self.spool_path = spool_path
+        self._pending: List[str] = []
+        self._pending_len = 0
+        self._spool_file = None
+        if spool_path is not None:
+            spool_path.unlink(missing_ok=True)
+
+    def __call__(self, delta: str) -> None:
+        self.count += len(delta)
+        if self.count >= self._next:
+            _safe_print(f"\r[INFO] {self.label}: 已接收 {self.count} 字", end="", flush=True)
+            self._next = self.count + self.step
+
+        if self.spool_path is not None:
+            self._pending.append(delta)
+            self._pending_len += len(delta)
+            if self._pending_len >= _SPOOL_FLUSH_CHARS and delta.rstrip(" ").endswith(_SENTENCE_ENDS):
+                self._flush_spool()
+
+    def _flush_spool(self) -> None:
+        if not self._pending:
+            return
+        if self._spool_file is None:
+            self._spool_file = open(self.spool_path, "a", encoding="utf-8")
+        self._spool_file.write("".join(self._pending))
+        self._spool_file.flush()
+        self._pending = []
+        self._pending_len = 0
+
+    def _close_spool(self) -> None:
+        if self._spool_file is not None:
+            self._spool_file.close()
+            self._spool_file = None
+
+    def finish(self) -> None:
+        """结束进度行（仅在输出过进度时换行），并写出剩余缓冲"""
+        if self.count >= self.step:
+            print()
+        if self.spool_path is not None:
+            self._flush_spool()
+            self._close_spool()
+
+    def discard_spool(self) -> None:
+        """生成结果已保存后删除落盘文件"""
+        if self.spool_path is not None:
+            self._pending = []
+            self._pending_len = 0
+            self._close_spool()
+            self.spool_path.unlink(missing_ok=True)
+
+
 def confirm_action(prompt: str, default: bool = False) -> bool:
     """
     请求用户确认
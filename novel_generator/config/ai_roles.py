@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class AIRoleConfig:
     provider: str = "doubao"
     model: str = ""
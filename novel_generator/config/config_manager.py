@@ -1,15 +1,23 @@
 from __future__ import annotations
 
-import json
 import logging
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from novel_generator.novel_manager import NovelManager
+from novel_generator.utils.file_handler import atomic_write_text, json_dumps
 from api.manager import APIManager
 
 logger = logging.getLogger(__name__)
 
+# 各服务商未配置扩写模型时使用的默认模型；未知服务商按豆包处理
+_DEFAULT_EXPANSION_MODELS = {
+    "deepseek": "deepseek-chat",
+    "doubao": "doubao-seed-2-0-lite-260215",
+}
+
 
 class ConfigManager:
     """配置管理器 - 仅支持新架构（novels/{novel_id}/）"""
@@ -105,16 +113,13 @@ class ConfigManager:
         provider = api_config.provider
         model = api_config.models.get("expansion_model", "") if api_config.models else ""
         if not model:
-            model = "deepseek-chat" if provider == "deepseek" else "doubao-seed-2-0-lite-260215"
+            model = _DEFAULT_EXPANSION_MODELS.get(provider, _DEFAULT_EXPANSION_MODELS["doubao"])
 
-        if provider == "deepseek":
-            config["deepseek_api_key"] = api_config.api_key
-            config["deepseek_api_base_url"] = api_config.api_base_url
-            config["deepseek_models"] = api_config.models
-        elif provider == "doubao":
-            config["doubao_api_key"] = api_config.api_key
-            config["doubao_api_base_url"] = api_config.api_base_url
-            config["doubao_models"] = api_config.models
+        # 客户端按 "{服务商}_api_key" 等带前缀的键读取配置
+        if provider in _DEFAULT_EXPANSION_MODELS:
+            config[f"{provider}_api_key"] = api_config.api_key
+            config[f"{provider}_api_base_url"] = api_config.api_base_url
+            config[f"{provider}_models"] = api_config.models
 
         config["ai_roles"] = {
             "generator": {
@@ -136,6 +141,12 @@ class ConfigManager:
         config["novel_generation"]["default_word_count"] = gen_config.get(
             "default_word_count", 1500
         )
+
+        # 开启后相同请求（提示词和参数完全一致）直接复用上次的响应
+        if gen_config.get("response_cache", False):
+            config.setdefault("system", {}).setdefault("api", {})["response_cache_dir"] = str(
+                self._novel.novel_dir / "cache" / "responses"
+            )
         return config
 
     def get_api_config(self) -> Dict[str, Any]:
@@ -172,10 +183,16 @@ class ConfigManager:
         start_chapter: int,
         end_chapter: int,
         outline_file: Optional[str] = None,
+        clean_chapters: Optional[Iterable[int]] = None,
     ) -> bool:
-        """更新进度"""
+        """更新进度（可同时将 clean_chapters 标记为 clean，只读写一次状态文件）"""
         state = self._novel.load_state()
 
+        if clean_chapters:
+            chapter_states = state.get("chapter_states", {})
+            chapter_states.update(dict.fromkeys(map(str, clean_chapters), "clean"))
+            state["chapter_states"] = chapter_states
+
         if action == "draft":
             state["last_draft_chapter"] = end_chapter
         elif action == "outline":
@@ -184,14 +201,16 @@ class ConfigManager:
         if outline_file:
             state["outline_file"] = outline_file
 
-        state["last_session_at"] = __import__("datetime").datetime.now().isoformat()
+        state["last_session_at"] = datetime.now().isoformat()
 
         return self._novel.save_state(state)
 
-    def get_continue_info(self, action: str = "draft") -> Dict[str, Any]:
-        """获取续写信息"""
-        state = self._novel.load_state()
-        novel_config = self._novel.load_config()
+    def get_continue_info(
+        self, action: str = "draft", state: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """获取续写信息（可传入已读取的 state 避免重复读盘）"""
+        if state is None:
+            state = self._novel.load_state()
 
         if action == "draft":
             last_chapter = state.get("last_draft_chapter", 0)
@@ -235,11 +254,23 @@ class ConfigManager:
         state_data["chapter_states"] = chapter_states
         return self._novel.save_state(state_data)
 
+    def set_chapter_states(self, chapter_nums: Iterable[int], state: str) -> bool:
+        """批量设置章节状态（只读写一次状态文件；中途出错时已设置的章节也会保存）"""
+        state_data = self._novel.load_state()
+        chapter_states = state_data.get("chapter_states", {})
+        try:
+            for chapter_num in chapter_nums:
+                chapter_states[str(chapter_num)] = state
+        finally:
+            state_data["chapter_states"] = chapter_states
+            saved = self._novel.save_state(state_data)
+        return saved
+
     def add_session_record(self, **kwargs) -> bool:
         """添加会话记录（新架构暂不支持，保留接口）"""
         # 新架构暂不支持会话记录，仅更新最后会话时间
         state = self._novel.load_state()
-        state["last_session_at"] = __import__("datetime").datetime.now().isoformat()
+        state["last_session_at"] = datetime.now().isoformat()
         return self._novel.save_state(state)
 
     def mark_dirty_cascade(self, chapter_num: int, draft_window: int) -> int:
@@ -259,9 +290,10 @@ class ConfigManager:
         self._novel.save_state(state)
         return count
 
-    def get_first_dirty_chapter(self) -> int:
+    def get_first_dirty_chapter(self, state: Optional[Dict[str, Any]] = None) -> int:
         """获取第一个dirty章节，返回章节号或0"""
-        state = self._novel.load_state()
+        if state is None:
+            state = self._novel.load_state()
         chapter_states = state.get("chapter_states", {})
 
         dirty_chapters = [int(k) for k, v in chapter_states.items() if v == "dirty"]
@@ -273,15 +305,17 @@ class ConfigManager:
         chapter_states = state.get("chapter_states", {})
         return chapter_states.get(str(chapter_num), "clean")
 
-    def get_chapter_states_summary(self) -> Dict[str, int]:
+    def get_chapter_states_summary(self, state: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
         """获取章节状态统计"""
-        state = self._novel.load_state()
+        if state is None:
+            state = self._novel.load_state()
         chapter_states = state.get("chapter_states", {})
 
+        counts = Counter(chapter_states.values())
         return {
-            "clean": sum(1 for v in chapter_states.values() if v == "clean"),
-            "dirty": sum(1 for v in chapter_states.values() if v == "dirty"),
-            "cosmetic": sum(1 for v in chapter_states.values() if v == "cosmetic"),
+            "clean": counts["clean"],
+            "dirty": counts["dirty"],
+            "cosmetic": counts["cosmetic"],
             "total": len(chapter_states),
         }
 
@@ -293,6 +327,4 @@ def get_config_manager(project_root: str = ".", novel_id: Optional[str] = None)
 
 def dump_json(path: Path, payload: Dict[str, Any]) -> None:
     """保存JSON文件"""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    atomic_write_text(path, json_dumps(payload))
@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from novel_generator.config.ai_roles import AIRoleConfig, AIRolesConfig
+from novel_generator.utils.file_handler import atomic_write_text, json_dumps
 
 
 @dataclass
@@ -249,8 +250,7 @@ class Settings:
         """
         try:
             config_dict = self.to_dict()
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(config_dict, f, ensure_ascii=False, indent=2)
+            atomic_write_text(file_path, json_dumps(config_dict))
         except Exception as e:
             raise Exception(f"保存配置文件失败: {e}")
 
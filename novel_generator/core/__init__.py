@@ -3,8 +3,15 @@
 包含大纲生成、章节扩写等核心功能
 """
 
-from novel_generator.core.chapter_expander import ChapterExpander
-
 __all__ = [
     "ChapterExpander",
 ]
+
+
+def __getattr__(name):
+    """按需导入 ChapterExpander，导入子模块（如 ai_roles）时不连带加载扩写器"""
+    if name == "ChapterExpander":
+        from novel_generator.core.chapter_expander import ChapterExpander
+
+        return ChapterExpander
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,15 +5,27 @@
 """
 
 import re
-import yaml
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional
 
 from novel_generator.config.settings import Settings
-from novel_generator.utils.multi_model_client import MultiModelClient
+from novel_generator.utils.multi_model_client import MultiModelClient, get_multi_model_client
+from novel_generator.utils.file_handler import atomic_write_text, yaml_dump
 from novel_generator.core.ai_roles import AIRoleManager, AIRole
 
+# 列表项前缀（"- " 及其后空白）
+_BULLET_PREFIX_RE = re.compile(r"^[-\s]+")
+# AI 自动生成的章节标记（编号需与当前章一致才清理）
+_CHAPTER_MARKER_RES = (
+    re.compile(r"^第(\d+)章[：:\s]*"),
+    re.compile(r"^Chapter\s*(\d+)[：:\s]*", re.IGNORECASE),
+)
+_NUMBER_PREFIX_RE = re.compile(r"^\d+[\.、\s]+")
+# 正文文件名 "第N章.txt" 中的章节号
+_CHAPTER_FILE_RE = re.compile(r"第(\d+)章")
+
 
 class BatchExpansionError(Exception):
     """批量生成错误"""
@@ -58,51 +70,156 @@ def _summarize_chapter_skeleton(ch_data: Dict[str, Any]) -> str:
     return " | ".join(parts)
 
 
-def _build_outline_context(outline: Dict[str, Any], current_ch: int, window: int = 30) -> str:
-    """构建前N章大纲上下文（骨架级摘要，含叙事逻辑链）"""
+def _build_outline_block(outline: Dict[str, Any], ch: int) -> str:
+    """构建单章大纲摘要块，大纲中无该章时返回空串"""
+    ch_data = outline.get(f"第{ch}章")
+    if not ch_data:
+        return ""
+    title = ch_data.get("标题", "")
+    summary = _summarize_chapter_skeleton(ch_data)
+
+    block = f"【第{ch}章】"
+    if title:
+        block += f" {title}"
+    block += "\n"
+    if summary:
+        block += f"  {summary}\n"
+    return block
+
+
+def _build_outline_context(
+    outline: Dict[str, Any],
+    current_ch: int,
+    window: int = 30,
+    block_cache: Optional[Dict[int, str]] = None,
+) -> str:
+    """
+    构建前N章大纲上下文（骨架级摘要，含叙事逻辑链）
+
+    Args:
+        outline: 大纲字典
+        current_ch: 当前章节号
+        window: 向前取的章节数
+        block_cache: 可选的摘要块缓存（章节号 -> 摘要块）。逐章循环时传入同一个
+            dict，相邻章节窗口重叠部分的摘要只生成一次；大纲变更后需换用新 dict
+
+    Returns:
+        str: 大纲上下文
+    """
     start = max(1, current_ch - window)
     parts = []
     for ch in range(start, current_ch):
-        ch_key = f"第{ch}章"
-        ch_data = outline.get(ch_key)
-        if not ch_data:
-            continue
-        title = ch_data.get("标题", "")
-        summary = _summarize_chapter_skeleton(ch_data)
-
-        block = f"【第{ch}章】"
-        if title:
-            block += f" {title}"
-        block += "\n"
-        if summary:
-            block += f"  {summary}\n"
-        parts.append(block)
+        if block_cache is None:
+            block = _build_outline_block(outline, ch)
+        else:
+            block = block_cache.get(ch)
+            if block is None:
+                block = block_cache[ch] = _build_outline_block(outline, ch)
+        if block:
+            parts.append(block)
     return "\n".join(parts) if parts else ""
 
 
-def _build_draft_context(draft_dir: str, current_ch: int, window: int = 10) -> str:
-    """构建前N章正文全文上下文（从磁盘读取）"""
+def _read_draft(draft_path: Path, ch: int) -> Optional[str]:
+    """读取单章正文，不存在或读取失败返回 None"""
+    file_path = draft_path / f"第{ch:04d}章.txt"
+    if not file_path.exists():
+        return None
+    try:
+        return file_path.read_text(encoding="utf-8")
+    except Exception:
+        return None
+
+
+def _build_draft_context(
+    draft_dir: str,
+    current_ch: int,
+    window: int = 10,
+    text_cache: Optional[Dict[int, Optional[str]]] = None,
+) -> str:
+    """
+    构建前N章正文全文上下文（从磁盘读取）
+
+    Args:
+        draft_dir: 正文目录
+        current_ch: 当前章节号
+        window: 向前取的章节数
+        text_cache: 可选的正文缓存（章节号 -> 正文，None 表示不存在）。逐章循环时
+            传入同一个 dict，每章正文只读一次；保存新章节后应写入 text_cache[ch]
+
+    Returns:
+        str: 正文上下文
+    """
     start = max(1, current_ch - window)
     parts = []
     draft_path = Path(draft_dir)
+    if text_cache is not None:
+        # 滑出窗口的章节不再需要
+        for ch in [ch for ch in text_cache if ch < start]:
+            del text_cache[ch]
     for ch in range(start, current_ch):
-        file_path = draft_path / f"第{ch:04d}章.txt"
-        if not file_path.exists():
-            continue
-        try:
-            content = file_path.read_text(encoding="utf-8")
+        if text_cache is None:
+            content = _read_draft(draft_path, ch)
+        elif ch in text_cache:
+            content = text_cache[ch]
+        else:
+            content = text_cache[ch] = _read_draft(draft_path, ch)
+        if content is not None:
             parts.append(f"【第{ch}章】\n{content}")
-        except Exception:
-            continue
     return "\n\n".join(parts) if parts else ""
 
 
+class _BatchChapterSplitter:
+    """
+    批量流式响应的增量切分器：某章的结束分隔符一到，立即把该章交给回调
+
+    切分规则与 ChapterExpander._parse_batch_response 一致。只有收到含 "=" 的片段
+    （分隔符以 "===" 结尾）时才拼接未切分的文本查找分隔符，其余片段直接缓存。
+    """
+
+    def __init__(
+        self,
+        chapters: List[int],
+        separator_fmt: str,
+        on_chapter: Callable[[int, str], None],
+        clean: Callable[[str, int], str],
+        on_delta: Optional[Callable[[str], None]] = None,
+    ):
+        self._chapters = list(chapters)
+        self._index = 0
+        self._separator_fmt = separator_fmt
+        self._on_chapter = on_chapter
+        self._clean = clean
+        self._on_delta = on_delta
+        self._parts: List[str] = []
+
+    def __call__(self, delta: str) -> None:
+        if self._on_delta is not None:
+            self._on_delta(delta)
+        self._parts.append(delta)
+        if "=" not in delta:
+            return
+
+        text = "".join(self._parts)
+        while self._index < len(self._chapters):
+            ch_num = self._chapters[self._index]
+            separator = self._separator_fmt.format(ch=ch_num)
+            idx = text.find(separator)
+            if idx == -1:
+                break
+            self._index += 1
+            self._on_chapter(ch_num, self._clean(text[:idx].strip(), ch_num))
+            text = text[idx + len(separator):]
+        self._parts = [text]
+
+
 class ChapterExpander:
     """章节扩写器 — 章节级一次生成，不拆场景。支持批量生成以优化缓存。"""
 
     # 批量生成配置常量
     BATCH_SIZE_DEFAULT = 5
     BATCH_SIZE_MAX = 10
+    SAVE_WORKERS_MAX = 8
     CHAPTER_SEPARATOR = "===第{ch}章结束==="
 
     def __init__(
@@ -116,13 +233,13 @@ class ChapterExpander:
         self.settings = Settings(config)
         self.logger = logging.getLogger(__name__)
         self.project_root = project_root
-        self.multi_model_client = multi_model_client or MultiModelClient(config)
+        self.multi_model_client = multi_model_client or get_multi_model_client(config)
         self.ai_role_manager = AIRoleManager(config, self.multi_model_client)
         self.core_setting = core_setting or {}
 
-        # 缓存优化状态跟踪
-        self._static_prefix_built = False
-        self._static_messages: List[Dict[str, str]] = []
+        # 缓存优化状态跟踪（L1 静态系统消息只构建一次，逐章/逐批复用）
+        self._static_system_content: Optional[str] = None
+        self._batch_instructions: Optional[str] = None
         self._batch_stats = {
             "total_batches": 0,
             "total_chapters": 0,
@@ -130,12 +247,25 @@ class ChapterExpander:
 
         # 提示词标签缓存
         self._prompt_labels_cache: Dict[str, Any] = {}
+        self._prompt_manager = None
+
+        # 流式输出回调（可选），设置后生成过程中逐段接收文本
+        self.stream_callback: Optional[Callable[[str], None]] = None
+        # 批量生成时的单章完成回调（可选）：某章分隔符流式到达即以 (章节号, 正文) 调用，
+        # 不必等整批响应结束；回调抛出的异常只记录日志，不中断生成
+        self.chapter_callback: Optional[Callable[[int, str], None]] = None
+
+    def _get_prompt_manager(self):
+        """延迟创建并复用提示词管理器，各提示词文件在本实例内只解析一次"""
+        if self._prompt_manager is None:
+            from novel_generator.utils.prompt_manager import PromptManager
+            self._prompt_manager = PromptManager(self.project_root)
+        return self._prompt_manager
 
     def _get_prompt_labels(self) -> Dict[str, Any]:
         """延迟加载提示词标签配置（从 chapter_expansion.yaml）"""
         if not self._prompt_labels_cache:
-            from novel_generator.utils.prompt_manager import PromptManager
-            pm = PromptManager(self.project_root)
+            pm = self._get_prompt_manager()
             self._prompt_labels_cache = {
                 "system": pm.chapter_expansion_prompts.get("system", {}),
                 "batch_prompt": pm.get_batch_prompt_labels(),
@@ -168,6 +298,9 @@ class ChapterExpander:
         batch_size: int = None,
         outline_context: str = "",
         draft_context: str = "",
+        draft_dir: Optional[str] = None,
+        outline_window: Optional[int] = None,
+        draft_window: Optional[int] = None,
     ) -> Dict[int, str]:
         """
         范围扩写（新增主要入口）
@@ -177,8 +310,11 @@ class ChapterExpander:
             end_ch: 结束章节号
             outline: 完整大纲数据
             batch_size: 每批章节数，None则使用默认值
-            outline_context: 前文大纲上下文（可选，用于批量优化）
-            draft_context: 前文正文上下文（可选，用于批量优化）
+            outline_context: 起始章节的前文大纲上下文（可选，调用方已构建时直接使用）
+            draft_context: 起始章节的前文正文上下文（可选，调用方已构建时直接使用）
+            draft_dir: 正文目录（读取前文正文），None则使用配置中的 draft_dir
+            outline_window: 大纲上下文窗口，None则使用配置值
+            draft_window: 正文上下文窗口，None则使用配置值
 
         Returns:
             Dict[int, str]: {章节号: 正文内容}
@@ -189,8 +325,25 @@ class ChapterExpander:
         batch_size = batch_size or self.BATCH_SIZE_DEFAULT
         batch_size = min(batch_size, self.BATCH_SIZE_MAX)
 
+        draft_dir = str(draft_dir or self.settings.path_config.draft_dir)
+        if outline_window is None:
+            outline_window = self.settings.get_outline_window()
+        if draft_window is None:
+            draft_window = self.settings.get_draft_window()
+
         results: Dict[int, str] = {}
         chapters = list(range(start_ch, end_ch + 1))
+        # 已生成章节写入正文缓存，后续批次即使尚未落盘也能取到前文
+        outline_blocks: Dict[int, str] = {}
+        draft_texts: Dict[int, Optional[str]] = {}
+
+        def _contexts(ch: int):
+            if ch == start_ch and (outline_context or draft_context):
+                return outline_context, draft_context
+            return (
+                _build_outline_context(outline, ch, outline_window, block_cache=outline_blocks),
+                _build_draft_context(draft_dir, ch, draft_window, text_cache=draft_texts),
+            )
 
         # 分批处理
         for i in range(0, len(chapters), batch_size):
@@ -198,8 +351,10 @@ class ChapterExpander:
             self.logger.info(f"处理批次 {i//batch_size + 1}: 第{batch[0]}-{batch[-1]}章")
 
             try:
-                batch_results = self._expand_batch(batch, outline)
+                outline_ctx, draft_ctx = _contexts(batch[0])
+                batch_results = self._expand_batch(batch, outline, outline_ctx, draft_ctx)
                 results.update(batch_results)
+                draft_texts.update(batch_results)
             except BatchExpansionError as e:
                 self.logger.warning(f"批量生成失败，回退到单章模式: {e}")
                 # 回退到单章模式
@@ -210,8 +365,10 @@ class ChapterExpander:
                         if not ch_outline:
                             self.logger.warning(f"第{ch}章无大纲数据，跳过")
                             continue
-                        content = self._expand_single(ch, ch_outline, outline)
+                        outline_ctx, draft_ctx = _contexts(ch)
+                        content = self._expand_single(ch, ch_outline, outline_ctx, draft_ctx)
                         results[ch] = content
+                        draft_texts[ch] = content
                     except Exception as e2:
                         self.logger.error(f"第{ch}章生成失败: {e2}")
                         raise ChapterExpansionError(f"第{ch}章生成失败: {e2}")
@@ -222,6 +379,8 @@ class ChapterExpander:
         self,
         chapters: List[int],
         outline: Dict[str, Any],
+        outline_ctx: str = "",
+        draft_ctx: str = "",
     ) -> Dict[int, str]:
         """
         批量生成核心实现
@@ -232,23 +391,35 @@ class ChapterExpander:
             return {}
 
         # 构建消息（缓存优化结构）
-        messages = self._build_batch_messages(chapters, outline)
+        messages = self._build_batch_messages(chapters, outline, outline_ctx, draft_ctx)
 
         # 计算所需token：根据章节数和字数目标
-        total_word_count = sum(
-            outline.get(f"第{ch}章", {}).get("字数目标", self.settings.get_default_word_count())
-            for ch in chapters
-        )
+        default_word_count = self.settings.get_default_word_count()
+        total_word_count = 0
+        for ch in chapters:
+            ch_outline = outline.get(f"第{ch}章")
+            total_word_count += (
+                ch_outline.get("字数目标", default_word_count) if ch_outline else default_word_count
+            )
         # 中文字符转token比例约1:1.5，添加buffer用于分隔符和额外内容
         required_tokens = int(total_word_count * 1.5) + 5000
         self.logger.info(f"批量生成{len(chapters)}章，预估字数{total_word_count}，设置max_tokens={required_tokens}")
 
+        # 设置了单章回调时，边接收边切分已完成的章节
+        on_delta = self.stream_callback
+        if self.chapter_callback is not None:
+            on_delta = _BatchChapterSplitter(
+                chapters, self.CHAPTER_SEPARATOR, self._notify_chapter,
+                self._clean_chapter_markers, on_delta,
+            )
+
         # 调用API
         self.logger.info(f"发送批量生成请求（{len(chapters)}章）...")
         response = self.ai_role_manager.chat_completion(
             role=AIRole.GENERATOR,
             messages=messages,
             max_tokens=required_tokens,
+            on_delta=on_delta,
         )
 
         # 解析响应
@@ -268,17 +439,19 @@ class ChapterExpander:
         self,
         chapter_num: int,
         chapter_outline: Dict[str, Any],
-        outline: Dict[str, Any],
+        outline_ctx: str = "",
+        draft_ctx: str = "",
     ) -> str:
         """
         单章生成（回退模式）
         保持原有逻辑，但使用缓存优化的消息结构
         """
-        messages = self._build_single_messages(chapter_num, chapter_outline, outline)
+        messages = self._build_single_messages(chapter_num, chapter_outline, outline_ctx, draft_ctx)
 
         response = self.ai_role_manager.chat_completion(
             role=AIRole.GENERATOR,
             messages=messages,
+            on_delta=self.stream_callback,
         )
 
         return self._quick_polish(response)
@@ -287,6 +460,8 @@ class ChapterExpander:
         self,
         chapters: List[int],
         outline: Dict[str, Any],
+        outline_ctx: str = "",
+        draft_ctx: str = "",
     ) -> List[Dict[str, str]]:
         """
         构建DeepSeek缓存友好的消息结构
@@ -298,28 +473,22 @@ class ChapterExpander:
         L4 (动态): 多章骨架
         """
         messages: List[Dict[str, str]] = []
-        start_ch = min(chapters)
 
         # ===== L1: System + 核心设定 =====
-        system_content = self._build_system_content()
-        if self.core_setting:
-            core_setting_yaml = yaml.dump(
-                self.core_setting,
-                allow_unicode=True,
-                default_flow_style=False
-            )
-            system_content += f"\n\n【核心设定】\n{core_setting_yaml}"
+        system_content = self._get_static_system_content()
 
         messages.append({"role": "system", "content": system_content})
 
         # ===== L2: 前文正文上下文（保持文风连贯） =====
-        draft_ctx = _build_draft_context(
-            str(self.settings.path_config.draft_dir), start_ch, self.settings.get_draft_window()
-        )
         if draft_ctx:
-            messages.append({"role": "user", "content": f"【前文正文（保持文风连贯）】\n{draft_ctx}"})
+            messages.append(self._draft_context_message(draft_ctx))
             messages.append({"role": "assistant", "content": "已接收前文正文。"})
 
+        # ===== L3: 前文大纲上下文（保证宏观连续性） =====
+        if outline_ctx:
+            messages.append({"role": "user", "content": f"【前文大纲上下文（保证宏观连续性）】\n{outline_ctx}"})
+            messages.append({"role": "assistant", "content": "已接收前文大纲。"})
+
         # ===== L4: 多章骨架（动态内容） =====
         batch_prompt = self._build_batch_prompt(chapters, outline)
         messages.append({"role": "user", "content": batch_prompt})
@@ -333,43 +502,50 @@ class ChapterExpander:
         self,
         chapter_num: int,
         chapter_outline: Dict[str, Any],
-        outline: Dict[str, Any],
+        outline_ctx: str = "",
+        draft_ctx: str = "",
     ) -> List[Dict[str, str]]:
         """构建单章生成的消息结构"""
         messages: List[Dict[str, str]] = []
 
         # L1: System + 核心设定
-        system_content = self._build_system_content()
-        if self.core_setting:
-            core_setting_yaml = yaml.dump(
-                self.core_setting,
-                allow_unicode=True,
-                default_flow_style=False
-            )
-            system_content += f"\n\n【核心设定】\n{core_setting_yaml}"
+        system_content = self._get_static_system_content()
         messages.append({"role": "system", "content": system_content})
 
         # L2: 前文正文上下文（保持文风连贯）
-        draft_ctx = _build_draft_context(
-            str(self.settings.path_config.draft_dir), chapter_num, self.settings.get_draft_window()
-        )
         if draft_ctx:
-            messages.append({"role": "user", "content": f"【前文正文（保持文风连贯）】\n{draft_ctx}"})
+            messages.append(self._draft_context_message(draft_ctx))
 
         # L4: 当前章节骨架
         chapter_prompt = self._build_chapter_prompt(
-            chapter_num, chapter_outline, "", draft_ctx  # outline_ctx 不再需要
+            chapter_num, chapter_outline, outline_ctx, draft_ctx
         )
         messages.append({"role": "user", "content": chapter_prompt})
 
         return messages
 
+    @staticmethod
+    def _draft_context_message(draft_ctx: str) -> Dict[str, str]:
+        """把前文正文上下文包装成 L2 用户消息（批量与单章共用同一格式，利于前缀缓存）"""
+        return {"role": "user", "content": f"【前文正文（保持文风连贯）】\n{draft_ctx}"}
+
+    def _get_static_system_content(self) -> str:
+        """L1 静态层：系统提示词 + 核心设定 YAML（首次调用时构建并缓存）"""
+        if self._static_system_content is None:
+            system_content = self._build_system_content()
+            if self.core_setting:
+                core_setting_yaml = yaml_dump(
+                    self.core_setting,
+                    allow_unicode=True,
+                    default_flow_style=False
+                )
+                system_content += f"\n\n【核心设定】\n{core_setting_yaml}"
+            self._static_system_content = system_content
+        return self._static_system_content
+
     def _build_system_content(self) -> str:
         """构建系统提示词内容（从配置文件加载）"""
-        from novel_generator.utils.prompt_manager import PromptManager
-
-        prompt_manager = PromptManager(self.project_root)
-        template = prompt_manager.get_system_prompt("generator")
+        template = self._get_prompt_manager().get_system_prompt("generator")
 
         labels = self._get_prompt_labels()
         sys_labels = labels.get("system", {})
@@ -392,7 +568,7 @@ class ChapterExpander:
                                 current_section = item
                                 taboo_lines.append(f"\n{item}")
                             elif current_section and item.startswith("-"):
-                                taboo_lines.append(f"• {item.lstrip('- ').strip()}")
+                                taboo_lines.append(f"• {_BULLET_PREFIX_RE.sub('', item).rstrip()}")
                             elif item.strip():
                                 taboo_lines.append(f"• {item}")
                 elif isinstance(禁忌, dict):
@@ -430,10 +606,48 @@ class ChapterExpander:
         lines.append(task_tmpl.format(start_ch=chapters[0], end_ch=chapters[-1]))
         lines.append("")
 
+        # 写作技巧、进度控制、生成要求与分隔格式说明各批相同，只构建一次
+        lines.append(self._get_batch_instructions())
+
+        # 各章骨架
+        lines.append(divider)
+        lines.append(sl.get("skeleton_header", "【各章骨架】"))
+        lines.append(divider)
+        lines.append("")
+
+        skeleton_sep = sl.get("batch_skeleton_separator", ">>> 第{ch_num}章 <<<")
+        for ch_num in chapters:
+            ch_key = f"第{ch_num}章"
+            ch_outline = outline.get(ch_key, {})
+            skeleton = self._build_compact_skeleton(ch_num, ch_outline)
+
+            lines.append(f"\n{skeleton_sep.format(ch_num=ch_num)}")
+            lines.append(skeleton)
+            lines.append("")
+
+        lines.append("")
+        lines.append(divider)
+        lines.append(sl.get("generation_call", "请开始生成各章正文（务必遵守每章结尾卡点）："))
+        lines.append(divider)
+
+        return "\n".join(lines)
+
+    def _get_batch_instructions(self) -> str:
+        """批量提示中与章节无关的说明部分（首次调用时构建并缓存）"""
+        if self._batch_instructions is None:
+            self._batch_instructions = self._build_batch_instructions()
+        return self._batch_instructions
+
+    def _build_batch_instructions(self) -> str:
+        """构建写作技巧、进度控制、生成要求与章节分隔格式说明（从配置文件加载）"""
+        bp = self._get_prompt_labels().get("batch_prompt", {})
+        sl = bp.get("section_labels", {})
+
+        lines: List[str] = []
+
         # 从配置文件加载写作技巧
-        from novel_generator.utils.prompt_manager import PromptManager
-        prompt_manager = PromptManager(self.project_root)
-        batch_rules = prompt_manager.generation_prompts.get("batch_writing_rules", {})
+        generation_prompts = self._get_prompt_manager().generation_prompts
+        batch_rules = generation_prompts.get("batch_writing_rules", {})
 
         if batch_rules:
             lines.append(sl.get("writing_tips", "【写作技巧要求】"))
@@ -469,7 +683,7 @@ class ChapterExpander:
             lines.append("")
 
         # 加载进度控制规则
-        progress_rules = prompt_manager.generation_prompts.get("progress_control", {})
+        progress_rules = generation_prompts.get("progress_control", {})
         if progress_rules:
             rules = progress_rules.get("rules", [])
             if rules:
@@ -502,27 +716,6 @@ class ChapterExpander:
             lines.append("例如：第13章结束后写 '===第13章结束==='")
         lines.append("")
 
-        # 各章骨架
-        lines.append(divider)
-        lines.append(sl.get("skeleton_header", "【各章骨架】"))
-        lines.append(divider)
-        lines.append("")
-
-        skeleton_sep = sl.get("batch_skeleton_separator", ">>> 第{ch_num}章 <<<")
-        for ch_num in chapters:
-            ch_key = f"第{ch_num}章"
-            ch_outline = outline.get(ch_key, {})
-            skeleton = self._build_compact_skeleton(ch_num, ch_outline)
-
-            lines.append(f"\n{skeleton_sep.format(ch_num=ch_num)}")
-            lines.append(skeleton)
-            lines.append("")
-
-        lines.append("")
-        lines.append(divider)
-        lines.append(sl.get("generation_call", "请开始生成各章正文（务必遵守每章结尾卡点）："))
-        lines.append(divider)
-
         return "\n".join(lines)
 
     def _build_compact_skeleton(self, ch_num: int, ch_outline: Dict[str, Any]) -> str:
@@ -623,47 +816,51 @@ class ChapterExpander:
     ) -> Dict[int, str]:
         """从批量响应中解析各章内容"""
         results: Dict[int, str] = {}
-        remaining = response
+        # 按偏移量向后查找分隔符，避免每章都复制一遍剩余文本
+        pos = 0
 
         for ch_num in expected_chapters:
             separator = self.CHAPTER_SEPARATOR.format(ch=ch_num)
+            idx = response.find(separator, pos)
 
-            if separator in remaining:
-                parts = remaining.split(separator, 1)
-                content = parts[0].strip()
-                content = self._clean_chapter_markers(content, ch_num)
-                results[ch_num] = content
-
-                if len(parts) > 1:
-                    remaining = parts[1]
-                else:
-                    remaining = ""
+            if idx != -1:
+                content = response[pos:idx].strip()
+                results[ch_num] = self._clean_chapter_markers(content, ch_num)
+                pos = idx + len(separator)
             else:
                 # 可能是最后一章
-                if ch_num == expected_chapters[-1] and remaining.strip():
-                    results[ch_num] = self._clean_chapter_markers(remaining.strip(), ch_num)
-                    remaining = ""
+                remaining = response[pos:].strip()
+                if ch_num == expected_chapters[-1] and remaining:
+                    results[ch_num] = self._clean_chapter_markers(remaining, ch_num)
+                    pos = len(response)
                 else:
                     self.logger.warning(f"第{ch_num}章的分隔符未找到")
                     break
 
         return results
 
+    def _notify_chapter(self, ch_num: int, content: str) -> None:
+        """把流式切分出的单章交给 chapter_callback"""
+        try:
+            self.chapter_callback(ch_num, content)
+        except Exception as e:
+            self.logger.warning(f"第{ch_num}章流式回调失败: {e}")
+
     def _clean_chapter_markers(self, content: str, ch_num: int) -> str:
         """清理AI自动生成的章节标记"""
-        patterns = [
-            rf"^第{ch_num}章[：:\s]*",
-            rf"^Chapter\s*{ch_num}[：:\s]*",
-            rf"^\d+[\.、\s]+",
-        ]
-
-        for pattern in patterns:
-            content = re.sub(pattern, "", content, flags=re.IGNORECASE)
+        for marker_re in _CHAPTER_MARKER_RES:
+            matched = marker_re.match(content)
+            if matched and int(matched.group(1)) == ch_num:
+                content = content[matched.end():]
 
+        content = _NUMBER_PREFIX_RE.sub("", content, count=1)
         return content.strip()
 
     def _log_message_structure(self, messages: List[Dict[str, str]]):
         """记录消息结构用于调试"""
+        # 每批都会调用，未开启 DEBUG 时跳过统计与预览切片
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         total_chars = sum(len(m.get("content", "")) for m in messages)
         self.logger.debug(f"消息结构: {len(messages)}条消息, 总计{total_chars}字符")
         for i, msg in enumerate(messages):
@@ -768,30 +965,60 @@ class ChapterExpander:
         if not content:
             return ""
 
-        content = re.sub(r"\n{3,}", "\n\n", content)
-        content = content.replace('"', '"').replace('"', '"')
-        content = content.replace("'", "'").replace("'", "'")
-        lines = [line.strip() for line in content.split("\n")]
-        content = "\n".join(lines)
-        paragraphs = content.split("\n\n")
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
-        content = "\n\n".join(paragraphs)
-
-        return content.strip()
+        # 单遍扫描：逐行去空白，空行作为段落分隔，最后统一拼接
+        paragraphs: List[str] = []
+        current: List[str] = []
+        for line in content.split("\n"):
+            line = line.strip()
+            if line:
+                current.append(line)
+            elif current:
+                paragraphs.append("\n".join(current))
+                current = []
+        if current:
+            paragraphs.append("\n".join(current))
+
+        return "\n\n".join(paragraphs)
 
     def save_chapter(
         self, chapter_num: int, content: str, output_dir: str = None
     ) -> str:
         """保存章节到文件"""
         output_path = Path(output_dir or self.settings.path_config.draft_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-
         file_path = output_path / f"第{chapter_num:04d}章.txt"
-        file_path.write_text(content, encoding="utf-8")
+        atomic_write_text(file_path, content)
 
         self.logger.info(f"章节已保存: {file_path}")
         return str(file_path)
 
+    def save_chapters(
+        self, chapters: Dict[int, str], output_dir: str = None
+    ) -> Dict[int, Optional[Exception]]:
+        """
+        并行保存多章（每章写入都要 fsync，放到线程池里让磁盘等待相互重叠）
+
+        Args:
+            chapters: {章节号: 正文内容}
+            output_dir: 输出目录
+
+        Returns:
+            Dict[int, Optional[Exception]]: {章节号: 保存失败时的异常，成功为 None}，顺序与输入一致
+        """
+        if not chapters:
+            return {}
+
+        def _save(item):
+            ch, content = item
+            try:
+                self.save_chapter(ch, content, output_dir)
+                return ch, None
+            except Exception as e:
+                return ch, e
+
+        workers = min(len(chapters), self.SAVE_WORKERS_MAX)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(pool.map(_save, chapters.items()))
+
     def load_existing_chapter(self, chapter_num: int, draft_dir: str = None) -> str:
         """读取已存在的章节内容"""
         output_path = Path(draft_dir or self.settings.path_config.draft_dir)
@@ -810,13 +1037,12 @@ class ChapterExpander:
         existing = []
 
         if output_path.exists():
-            for f in output_path.glob("第*章.txt"):
-                try:
-                    match = re.search(r"第(\d+)章", f.name)
-                    if match:
-                        existing.append(int(match.group(1)))
-                except Exception:
-                    continue
+            existing = [
+                int(match.group(1))
+                for match in map(_CHAPTER_FILE_RE.search,
+                                 (f.name for f in output_path.glob("第*章.txt")))
+                if match
+            ]
 
         return sorted(existing)
 
@@ -832,6 +1058,8 @@ class ChapterExpander:
         """批量扩写多个章节"""
         results = []
         _draft_dir = draft_dir or self.settings.path_config.draft_dir
+        outline_blocks: Dict[int, str] = {}
+        draft_texts: Dict[int, Optional[str]] = {}
 
         for chapter_num in range(start_chapter, end_chapter + 1):
             chapter_key = f"第{chapter_num}章"
@@ -841,8 +1069,12 @@ class ChapterExpander:
                 self.logger.warning(f"未找到第{chapter_num}章的大纲，跳过")
                 continue
 
-            outline_ctx = _build_outline_context(outline, chapter_num, outline_window)
-            draft_ctx = _build_draft_context(_draft_dir, chapter_num, draft_window)
+            outline_ctx = _build_outline_context(
+                outline, chapter_num, outline_window, block_cache=outline_blocks
+            )
+            draft_ctx = _build_draft_context(
+                _draft_dir, chapter_num, draft_window, text_cache=draft_texts
+            )
 
             try:
                 content = self.expand_chapter(
@@ -853,6 +1085,7 @@ class ChapterExpander:
                 )
 
                 file_path = self.save_chapter(chapter_num, content, _draft_dir)
+                draft_texts[chapter_num] = content
 
                 results.append({
                     "chapter": chapter_num,
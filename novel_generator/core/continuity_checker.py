@@ -5,12 +5,131 @@
 
 import re
 import logging
+from collections import Counter
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
-@dataclass
+def _compile_labeled(patterns, flags=0):
+    """预编译 (正则, 标签) 列表"""
+    return tuple((re.compile(p, flags), label) for p, label in patterns)
+
+
+# 身体状态模式
+_BODY_PATTERNS = _compile_labeled([
+    # 受伤状态
+    (r"(?:受伤|重伤|轻伤|负伤|挂彩|流血|伤口|骨折|中毒|昏迷|晕倒)", "受伤"),
+    (r"(?:奄奄一息|命悬一线|危在旦夕|气息奄奄|生命垂危)", "重伤"),
+    # 疲劳状态
+    (r"(?:疲惫|疲劳|精疲力竭|筋疲力尽|气喘吁吁|汗流浃背)", "疲劳"),
+    # 良好状态
+    (r"(?:精力充沛|神采奕奕|精神焕发|容光焕发|气宇轩昂)", "良好"),
+    # 生病状态
+    (r"(?:生病|染病|不适|发烧|咳嗽|虚弱|病倒)", "生病"),
+])
+
+# 心理状态模式
+_MENTAL_PATTERNS = _compile_labeled([
+    (r"(?:愤怒|暴怒|大怒|愤怒|恼火|气愤|怒气冲冲|怒火中烧)", "愤怒"),
+    (r"(?:恐惧|害怕|惊恐|畏惧|胆寒|心悸|不寒而栗)", "恐惧"),
+    (r"(?:喜悦|高兴|欣喜|开心|兴奋|喜悦|欢喜|心花怒放)", "喜悦"),
+    (r"(?:悲伤|难过|伤心|悲痛|哀伤|凄然|黯然神伤)", "悲伤"),
+    (r"(?:紧张|焦虑|忐忑|不安|紧张|忧心忡忡|坐立不安)", "紧张"),
+    (r"(?:冷静|镇定|从容|淡定|泰然自若|从容不迫)", "冷静"),
+    (r"(?:犹豫|迟疑|纠结|踌躇|举棋不定|优柔寡断)", "犹豫"),
+    (r"(?:坚定|坚毅|决绝|果断|毫不犹豫|斩钉截铁)", "坚定"),
+])
+
+# 结尾情感模式
+_EMOTION_PATTERNS = _compile_labeled([
+    (r"(?:愤怒|暴怒|大怒|愤怒|怒火|怒气)", "愤怒"),
+    (r"(?:恐惧|害怕|惊恐|畏惧|胆寒|心悸)", "恐惧"),
+    (r"(?:喜悦|高兴|欣喜|开心|兴奋|欢喜)", "喜悦"),
+    (r"(?:悲伤|难过|伤心|悲痛|哀伤|凄然)", "悲伤"),
+    (r"(?:紧张|焦虑|忐忑|不安|忧心忡忡)", "紧张"),
+    (r"(?:冷静|镇定|从容|淡定|泰然)", "冷静"),
+    (r"(?:希望|期待|憧憬|向往|盼望)", "希望"),
+    (r"(?:失望|绝望|心灰意冷|万念俱灰)", "绝望"),
+    (r"(?:疑惑|困惑|不解|迷惑|纳闷)", "疑惑"),
+    (r"(?:释然|放松|轻松|解脱|如释重负)", "释然"),
+])
+
+# 新线需要的Setup元素
+_REQUIRED_SETUP = _compile_labeled([
+    (r"(?:场景|地点|环境|背景).*?(?:描写|描述|交代)", "新场景描写"),
+    (r"(?:人物|角色|新人).*?(?:登场|出场|出现|介绍)", "新人物登场"),
+    (r"(?:冲突|矛盾|事件|危机).*?(?:出现|发生|爆发)", "冲突引入"),
+    (r"(?:目标|动机|目的|打算|计划)", "人物动机"),
+], re.MULTILINE | re.UNICODE)
+
+# 明显不合理的位置跳跃（远距离地名）
+_FAR_REGION_RE = re.compile(r"(?:东|西|南|北).{0,5}(?:域|洲|界|国)")
+
+
+_SENTENCE_END_RE = re.compile(r"[。！？]")
+
+
+def _char_sentences(content: str, char_name: str, start: int = 0) -> List[str]:
+    """
+    包含指定角色的整句（以。！？结尾，末尾不完整的句子不算）
+
+    用 str.find 定位角色名，再向前后找句子边界，只在命中时切片，
+    不需要对每个起点回溯整句。start 之前的内容视为不存在（等价于先切片
+    content[start:]，但不复制字符串）。
+    """
+    sentences = []
+    pos = start
+    while True:
+        hit = content.find(char_name, pos)
+        if hit < 0:
+            break
+        end = _SENTENCE_END_RE.search(content, hit + len(char_name))
+        if end is None:
+            break
+        sentence_start = max(
+            pos - 1,
+            content.rfind("。", pos, hit),
+            content.rfind("！", pos, hit),
+            content.rfind("？", pos, hit),
+        ) + 1
+        sentences.append(content[sentence_start:end.end()])
+        pos = end.end()
+    return sentences
+
+
+@lru_cache(maxsize=256)
+def _location_res(char_name: str) -> Tuple["re.Pattern", ...]:
+    """指定角色的位置提取模式"""
+    location_patterns = [
+        # X来到/抵达/到达/进入/身处/位于/在 Y
+        rf"{char_name}[^。！？]*?(?:来到|抵达|到达|进入|身处|位于|在)[^。！？]*?([^。！？\s,，{{}}\[\]]{{2,20}})(?:中|里|内|处|旁|边|前|后|上|下)?[。，！？]",
+        # X返回/回到/赶回 Y
+        rf"{char_name}[^。！？]*?(?:返回|回到|赶回|退回)[^。！？]*?([^。！？\s,，{{}}\[\]]{{2,20}})(?:中|里|内|处)?[。，！？]",
+        # 在Y的X
+        rf"在([^。！？\s,，{{}}\[\]]{{2,15}})(?:中|里|内)?的{char_name}",
+        # Y中/里/内的X
+        rf"([^。！？\s,，{{}}\[\]]{{2,15}})(?:中|里|内|处)的{char_name}",
+    ]
+    return tuple(re.compile(p, re.MULTILINE | re.UNICODE) for p in location_patterns)
+
+
+@lru_cache(maxsize=256)
+def _item_res(char_name: str) -> Tuple["re.Pattern", ...]:
+    """指定角色的物品提取模式"""
+    item_patterns = [
+        # X手中握着/拿着/持着 Y
+        rf"{char_name}[^。！？]*?(?:手中|手里)[^。！？]*?(?:握着|拿着|持着|提着|捧着|抓着)[^。！？]*?([^。！？\s,，{{}}\[\]""']{{1,10}})",
+        # X取出/掏出/拿出 Y
+        rf"{char_name}[^。！？]*?(?:取出|掏出|拿出|抽出|亮出)[^。！？]*?([^。！？\s,，{{}}\[\]""']{{1,10}})",
+        # X的 Y (剑/刀/武器等)
+        rf"{char_name}的([^。！？\s,，{{}}\[\]""']{{1,8}}(?:剑|刀|枪|杖|鞭|扇|铃|镜|珠|玉|佩|囊|袋|瓶|壶))",
+    ]
+    return tuple(re.compile(p, re.MULTILINE | re.UNICODE) for p in item_patterns)
+
+
+@dataclass(slots=True)
 class CharacterState:
     """人物状态数据类"""
     name: str
@@ -21,7 +140,7 @@ class CharacterState:
     emotional_state: str = "平静"
 
 
-@dataclass
+@dataclass(slots=True)
 class ContinuityIssue:
     """连续性问题数据类"""
     type: str  # 问题类型: "character", "location", "item", "new_line", etc.
@@ -59,10 +178,13 @@ class StateExtractor:
             if char_name not in content:
                 continue
 
+            # 角色相关句子只扫描一遍，供身体/心理状态共用
+            sentences_text = "".join(_char_sentences(content, char_name))
+
             state = CharacterState(name=char_name)
             state.location = self._extract_location(char_name, content)
-            state.body_state = self._extract_body_state(char_name, content)
-            state.mental_state = self._extract_mental_state(char_name, content)
+            state.body_state = self._extract_body_state(char_name, content, sentences_text)
+            state.mental_state = self._extract_mental_state(char_name, content, sentences_text)
             state.holding_items = self._extract_items(char_name, content)
             state.emotional_state = self._extract_ending_emotion(char_name, content)
 
@@ -81,21 +203,8 @@ class StateExtractor:
         Returns:
             str: 提取到的位置
         """
-        # 位置提取模式
-        location_patterns = [
-            # X来到/抵达/到达/进入/身处/位于/在 Y
-            rf"{char_name}[^。！？]*?(?:来到|抵达|到达|进入|身处|位于|在)[^。！？]*?([^。！？\s,，{{}}\[\]]{{2,20}})(?:中|里|内|处|旁|边|前|后|上|下)?[。，！？]",
-            # X返回/回到/赶回 Y
-            rf"{char_name}[^。！？]*?(?:返回|回到|赶回|退回)[^。！？]*?([^。！？\s,，{{}}\[\]]{{2,20}})(?:中|里|内|处)?[。，！？]",
-            # 在Y的X
-            rf"在([^。！？\s,，{{}}\[\]]{{2,15}})(?:中|里|内)?的{char_name}",
-            # Y中/里/内的X
-            rf"([^。！？\s,，{{}}\[\]]{{2,15}})(?:中|里|内|处)的{char_name}",
-        ]
-
-        for pattern in location_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.UNICODE)
-            for match in matches:
+        for pattern in _location_res(char_name):
+            for match in pattern.finditer(content):
                 if match.lastindex and match.lastindex > 0:
                     location = match.group(1).strip()
                     # 过滤常见动词和虚词
@@ -118,78 +227,49 @@ class StateExtractor:
                 return ""
         return location
 
-    def _extract_body_state(self, char_name: str, content: str) -> str:
+    def _extract_body_state(
+        self, char_name: str, content: str, sentences_text: Optional[str] = None
+    ) -> str:
         """
         提取人物身体状态
 
         Args:
             char_name: 角色名称
             content: 章节内容
+            sentences_text: 已提取的角色相关句子（省略时从 content 中提取）
 
         Returns:
             str: 身体状态
         """
-        # 身体状态模式
-        body_patterns = [
-            # 受伤状态
-            (r"(?:受伤|重伤|轻伤|负伤|挂彩|流血|伤口|骨折|中毒|昏迷|晕倒)", "受伤"),
-            (r"(?:奄奄一息|命悬一线|危在旦夕|气息奄奄|生命垂危)", "重伤"),
-            # 疲劳状态
-            (r"(?:疲惫|疲劳|精疲力竭|筋疲力尽|气喘吁吁|汗流浃背)", "疲劳"),
-            # 良好状态
-            (r"(?:精力充沛|神采奕奕|精神焕发|容光焕发|气宇轩昂)", "良好"),
-            # 生病状态
-            (r"(?:生病|染病|不适|发烧|咳嗽|虚弱|病倒)", "生病"),
-        ]
-
         # 查找角色相关的句子
-        char_sentences = re.findall(
-            rf"[^。！？]*{char_name}[^。！？]*[。！？]",
-            content,
-            re.MULTILINE | re.UNICODE
-        )
+        if sentences_text is None:
+            sentences_text = "".join(_char_sentences(content, char_name))
 
-        sentences_text = "".join(char_sentences)
-
-        for pattern, state in body_patterns:
-            if re.search(pattern, sentences_text):
+        for pattern, state in _BODY_PATTERNS:
+            if pattern.search(sentences_text):
                 return state
 
         return "正常"
 
-    def _extract_mental_state(self, char_name: str, content: str) -> str:
+    def _extract_mental_state(
+        self, char_name: str, content: str, sentences_text: Optional[str] = None
+    ) -> str:
         """
         提取人物心理状态
 
         Args:
             char_name: 角色名称
             content: 章节内容
+            sentences_text: 已提取的角色相关句子（省略时从 content 中提取）
 
         Returns:
             str: 心理状态
         """
-        # 心理状态模式
-        mental_patterns = [
-            (r"(?:愤怒|暴怒|大怒|愤怒|恼火|气愤|怒气冲冲|怒火中烧)", "愤怒"),
-            (r"(?:恐惧|害怕|惊恐|畏惧|胆寒|心悸|不寒而栗)", "恐惧"),
-            (r"(?:喜悦|高兴|欣喜|开心|兴奋|喜悦|欢喜|心花怒放)", "喜悦"),
-            (r"(?:悲伤|难过|伤心|悲痛|哀伤|凄然|黯然神伤)", "悲伤"),
-            (r"(?:紧张|焦虑|忐忑|不安|紧张|忧心忡忡|坐立不安)", "紧张"),
-            (r"(?:冷静|镇定|从容|淡定|泰然自若|从容不迫)", "冷静"),
-            (r"(?:犹豫|迟疑|纠结|踌躇|举棋不定|优柔寡断)", "犹豫"),
-            (r"(?:坚定|坚毅|决绝|果断|毫不犹豫|斩钉截铁)", "坚定"),
-        ]
-
-        char_sentences = re.findall(
-            rf"[^。！？]*{char_name}[^。！？]*[。！？]",
-            content,
-            re.MULTILINE | re.UNICODE
-        )
+        if sentences_text is None:
+            sentences_text = "".join(_char_sentences(content, char_name))
 
-        sentences_text = "".join(char_sentences)
-
-        for pattern, state in mental_patterns:
-            if re.search(pattern, sentences_text):
+        for pattern, state in _MENTAL_PATTERNS:
+            if pattern.search(sentences_text):
                 return state
 
         return "平静"
@@ -207,19 +287,8 @@ class StateExtractor:
         """
         items = []
 
-        # 物品提取模式
-        item_patterns = [
-            # X手中握着/拿着/持着 Y
-            rf"{char_name}[^。！？]*?(?:手中|手里)[^。！？]*?(?:握着|拿着|持着|提着|捧着|抓着)[^。！？]*?([^。！？\s,，{{}}\[\]""']{{1,10}})",
-            # X取出/掏出/拿出 Y
-            rf"{char_name}[^。！？]*?(?:取出|掏出|拿出|抽出|亮出)[^。！？]*?([^。！？\s,，{{}}\[\]""']{{1,10}})",
-            # X的 Y (剑/刀/武器等)
-            rf"{char_name}的([^。！？\s,，{{}}\[\]""']{{1,8}}(?:剑|刀|枪|杖|鞭|扇|铃|镜|珠|玉|佩|囊|袋|瓶|壶))",
-        ]
-
-        for pattern in item_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.UNICODE)
-            for match in matches:
+        for pattern in _item_res(char_name):
+            for match in pattern.finditer(content):
                 if match.lastindex and match.lastindex > 0:
                     item = match.group(1).strip()
                     if item and len(item) >= 1 and item not in items:
@@ -238,36 +307,19 @@ class StateExtractor:
         Returns:
             str: 结尾情感状态
         """
-        # 取最后500字分析
-        ending_text = content[-500:] if len(content) > 500 else content
-
-        emotion_patterns = [
-            (r"(?:愤怒|暴怒|大怒|愤怒|怒火|怒气)", "愤怒"),
-            (r"(?:恐惧|害怕|惊恐|畏惧|胆寒|心悸)", "恐惧"),
-            (r"(?:喜悦|高兴|欣喜|开心|兴奋|欢喜)", "喜悦"),
-            (r"(?:悲伤|难过|伤心|悲痛|哀伤|凄然)", "悲伤"),
-            (r"(?:紧张|焦虑|忐忑|不安|忧心忡忡)", "紧张"),
-            (r"(?:冷静|镇定|从容|淡定|泰然)", "冷静"),
-            (r"(?:希望|期待|憧憬|向往|盼望)", "希望"),
-            (r"(?:失望|绝望|心灰意冷|万念俱灰)", "绝望"),
-            (r"(?:疑惑|困惑|不解|迷惑|纳闷)", "疑惑"),
-            (r"(?:释然|放松|轻松|解脱|如释重负)", "释然"),
-        ]
+        # 取最后500字分析（按下标限定范围，不复制结尾文本）
+        ending_start = max(0, len(content) - 500)
 
         # 查找包含角色名称的句子
-        char_sentences = re.findall(
-            rf"[^。！？]*{char_name}[^。！？]*[。！？]",
-            ending_text,
-            re.MULTILINE | re.UNICODE
-        )
+        char_sentences = _char_sentences(content, char_name, ending_start)
 
         if not char_sentences:
             return "未知"
 
         sentences_text = "".join(char_sentences)
 
-        for pattern, emotion in emotion_patterns:
-            if re.search(pattern, sentences_text):
+        for pattern, emotion in _EMOTION_PATTERNS:
+            if pattern.search(sentences_text):
                 return emotion
 
         return "平静"
@@ -428,23 +480,17 @@ class ContinuityChecker:
         Returns:
             Optional[ContinuityIssue]: 如果存在问题的返回问题对象
         """
-        # 明显不合理的位置跳跃
-        impossible_transitions = [
-            # 从极远地点瞬间移动
-            (r"(?:东|西|南|北).{0,5}(?:域|洲|界|国)", r"(?:东|西|南|北).{0,5}(?:域|洲|界|国)"),
-        ]
-
-        for prev_pattern, curr_pattern in impossible_transitions:
-            if re.search(prev_pattern, prev_loc) and re.search(curr_pattern, curr_loc):
-                if prev_loc != curr_loc:
-                    return ContinuityIssue(
-                        type="location",
-                        severity="high",
-                        character=character,
-                        expected=f"位置: {prev_loc}",
-                        actual=f"位置: {curr_loc}",
-                        suggestion=f"{character or '角色'}从'{prev_loc}'出现在'{curr_loc}'，位置跳跃过大，缺乏过渡"
-                    )
+        # 明显不合理的位置跳跃：从极远地点瞬间移动
+        if _FAR_REGION_RE.search(prev_loc) and _FAR_REGION_RE.search(curr_loc):
+            if prev_loc != curr_loc:
+                return ContinuityIssue(
+                    type="location",
+                    severity="high",
+                    character=character,
+                    expected=f"位置: {prev_loc}",
+                    actual=f"位置: {curr_loc}",
+                    suggestion=f"{character or '角色'}从'{prev_loc}'出现在'{curr_loc}'，位置跳跃过大，缺乏过渡"
+                )
 
         return None
 
@@ -503,16 +549,8 @@ class ContinuityChecker:
         if not narrative_line or "新线" not in str(narrative_line):
             return issues
 
-        # 新线需要的Setup元素
-        required_setup = [
-            (r"(?:场景|地点|环境|背景).*?(?:描写|描述|交代)", "新场景描写"),
-            (r"(?:人物|角色|新人).*?(?:登场|出场|出现|介绍)", "新人物登场"),
-            (r"(?:冲突|矛盾|事件|危机).*?(?:出现|发生|爆发)", "冲突引入"),
-            (r"(?:目标|动机|目的|打算|计划)", "人物动机"),
-        ]
-
-        for pattern, element_name in required_setup:
-            if not re.search(pattern, content, re.MULTILINE | re.UNICODE):
+        for pattern, element_name in _REQUIRED_SETUP:
+            if not pattern.search(content):
                 # 检查骨架中是否已声明此元素
                 skeleton_text = str(skeleton)
                 if element_name not in skeleton_text:
@@ -549,9 +587,10 @@ class ContinuityChecker:
                 "issues": []
             }
 
-        high = sum(1 for i in issues if i.severity == "high")
-        medium = sum(1 for i in issues if i.severity == "medium")
-        low = sum(1 for i in issues if i.severity == "low")
+        severity_counts = Counter(i.severity for i in issues)
+        high = severity_counts["high"]
+        medium = severity_counts["medium"]
+        low = severity_counts["low"]
 
         status = "failed" if high > 0 else "warning" if medium > 0 else "passed"
 
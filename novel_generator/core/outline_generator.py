@@ -10,12 +10,57 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from novel_generator.config.settings import Settings
-from novel_generator.utils.multi_model_client import MultiModelClient
+from novel_generator.utils.multi_model_client import (
+    DEFAULT_CONCURRENCY, MultiModelClient, get_multi_model_client
+)
+from novel_generator.utils.file_handler import (
+    atomic_write_text, json_dumps, json_loads, yaml_dump, yaml_load
+)
+from novel_generator.utils.common import (
+    load_outline_file, load_yaml_file, normalize_core_setting
+)
 from novel_generator.core.ai_roles import AIRoleManager, AIRole
 
+# 整行代码块标记（```json / ```yaml / ```），连同行尾换行一起移除
+_CODE_FENCE_LINE_RE = re.compile(r"^[ \t]*```[^\n]*(?:\n|$)", re.MULTILINE)
+# 简单解析：一次扫描全文，每个匹配是一行章节标题（chapter/title）
+# 或一行字段（field/value，可带 "- " 列表前缀），首尾空白不计入
+_SIMPLE_LINE_RE = re.compile(
+    r"^\s*(?:"
+    r"第[^\S\n]*(?P<chapter>\d+)[^\S\n]*章[^\S\n]*[:：]?[^\S\n]*(?P<title>.*?)"
+    r"|(?:- )?(?P<field>标题|核心事件|场景|人物行动|伏笔回收|字数目标|目标字数|字数)[:：][^\S\n]*(?P<value>.*?)"
+    r")\s*$",
+    re.MULTILINE,
+)
+_DIGITS_RE = re.compile(r"\d+")
+# chapter_plan 的区间键，如 "第1-5章"
+_PLAN_RANGE_RE = re.compile(r"第(\d+)-(\d+)章")
+# 伏笔回收字段的分隔符
+_FORESHADOW_SPLIT_RE = re.compile(r"[,，；;、]")
+# 换行以外的控制字符（JSON 字符串内不允许出现）
+_CONTROL_CHAR_RE = re.compile(r"[\x00-\x09\x0b-\x1f]")
+
+# 大纲必需字段及缺失时的默认值（按校验顺序排列）
+_OUTLINE_FIELD_DEFAULTS = {
+    "标题": "未命名章节",
+    "核心事件": "待定",
+    "场景": "待定",
+    "人物行动": "待定",
+    "伏笔回收": "无",
+    "字数目标": "1500字左右",
+}
+# 字段的已知别名
+_OUTLINE_FIELD_ALIASES = {
+    "字数目标": ("目标字数", "字数"),
+}
+# 缺失时可以从名称相近的字段补全的字段
+_OUTLINE_FUZZY_FIELDS = frozenset({"标题", "核心事件", "场景", "人物行动"})
+
+
 class RetryableGenerationError(Exception):
     pass
 
@@ -198,7 +243,7 @@ class SlidingWindowSkeletonGenerator:
 
         # 核心设定
         if self.core_setting:
-            core_yaml = yaml.dump(
+            core_yaml = yaml_dump(
                 self.core_setting, allow_unicode=True, default_flow_style=False
             )
             parts.append(f"{sl.get('core_setting', '【核心设定】')}\n{core_yaml}")
@@ -389,17 +434,18 @@ class SlidingWindowSkeletonGenerator:
         plan_data = self.chapter_plan.get("剧情规划", {})
 
         for range_key, plan_item in plan_data.items():
-            match = re.search(r"第(\d+)-(\d+)章", range_key)
+            match = _PLAN_RANGE_RE.search(range_key)
             if match:
                 plan_start, plan_end = int(match.group(1)), int(match.group(2))
                 if plan_start <= end_ch and plan_end >= start_ch:
-                    involved.append({
+                    involved.append((plan_start, {
                         "range": range_key,
                         "data": plan_item
-                    })
+                    }))
 
-        involved.sort(key=lambda x: int(re.search(r"第(\d+)", x["range"]).group(1)))
-        return involved
+        # 按解析时得到的起始章排序，无需再次匹配
+        involved.sort(key=lambda x: x[0])
+        return [item for _, item in involved]
 
     def _call_ai_api(self) -> str:
         """调用AI API"""
@@ -429,23 +475,29 @@ class SlidingWindowSkeletonGenerator:
         start_ch, end_ch = chapter_range
         try:
             cleaned = self._clean_markdown_response(response)
-            data = json.loads(cleaned)
+            data = json_loads(cleaned)
 
             if not isinstance(data, dict):
                 raise ValueError("响应不是JSON对象")
 
             # 提取章节骨架
             skeletons = {}
+            key_index = None
             for ch in range(start_ch, end_ch + 1):
                 key = f"第{ch}章"
                 if key in data:
                     skeletons[key] = data[key]
-                else:
-                    # 尝试其他可能的键格式
-                    for k in data.keys():
-                        if str(ch) in k and "章" in k:
-                            skeletons[key] = data[k]
-                            break
+                    continue
+                # 其他键格式（如 "第 3 章"）：首次需要时按键内章节号建索引，
+                # 只遍历一次，且按完整数字匹配（第1章不会误取"第11章"）
+                if key_index is None:
+                    key_index = {}
+                    for k in data:
+                        matched = _DIGITS_RE.search(k) if "章" in k else None
+                        if matched:
+                            key_index.setdefault(int(matched.group()), k)
+                if ch in key_index:
+                    skeletons[key] = data[key_index[ch]]
 
             if skeletons:
                 self.logger.info(f"解析到 {len(skeletons)} 章骨架")
@@ -461,19 +513,11 @@ class SlidingWindowSkeletonGenerator:
 
     def _clean_markdown_response(self, response: str) -> str:
         """清理Markdown格式的响应"""
-        lines = response.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            if line.strip().startswith("```"):
-                continue
-            cleaned_lines.append(line)
-        result = "\n".join(cleaned_lines)
-
-        # 修复中文引号为英文引号（JSON标准）
-        result = result.replace('"', '"').replace('"', '"')  # 双引号
-        result = result.replace("'", "'").replace("'", "'")  # 单引号
+        result = _CODE_FENCE_LINE_RE.sub("", response)
 
-        # 修复JSON字符串内未转义的控制字符
+        # 修复JSON字符串内未转义的控制字符；正常响应不含此类字符，直接跳过逐字符扫描
+        if not _CONTROL_CHAR_RE.search(result):
+            return result
         in_string = False
         escaped = False
         chars = list(result)
@@ -552,16 +596,26 @@ class SlidingWindowSkeletonGenerator:
         """回退到单章生成模式"""
         self.logger.info(f"回退到单章模式: 第{start_ch}-{end_ch}章")
 
-        all_skeletons = {}
-        for ch in range(start_ch, end_ch + 1):
+        # 各章只依赖同一份已有大纲，互不依赖，可并发请求（限流仍由客户端控制）
+        chapters = list(range(start_ch, end_ch + 1))
+        max_workers = self.config.get("system", {}).get("api", {}).get(
+            "concurrency", DEFAULT_CONCURRENCY
+        )
+        max_workers = max(1, min(len(chapters), max_workers))
+
+        def _generate(ch: int) -> Optional[Dict[str, Any]]:
             try:
-                # 使用原有的ChapterSkeletonGenerator逻辑
-                # 这里简化处理，实际可以调用原有方法
-                sk = self._generate_single_chapter(ch, existing_skeletons)
-                if sk:
-                    all_skeletons[f"第{ch}章"] = sk
+                return self._generate_single_chapter(ch, existing_skeletons)
             except Exception as e:
                 self.logger.error(f"第{ch}章生成失败: {e}")
+                return None
+
+        all_skeletons = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map 按提交顺序返回，保证章节顺序稳定
+            for ch, sk in zip(chapters, executor.map(_generate, chapters)):
+                if sk:
+                    all_skeletons[f"第{ch}章"] = sk
 
         return all_skeletons
 
@@ -605,7 +659,7 @@ class SlidingWindowSkeletonGenerator:
         """解析单章响应"""
         try:
             cleaned = self._clean_markdown_response(response)
-            data = json.loads(cleaned)
+            data = json_loads(cleaned)
 
             # 尝试获取第一个章节数据
             for key, value in data.items():
@@ -660,7 +714,7 @@ class OutlineGenerator:
         if multi_model_client:
             self.multi_model_client = multi_model_client
         else:
-            self.multi_model_client = MultiModelClient(config)
+            self.multi_model_client = get_multi_model_client(config)
 
         self.ai_role_manager = AIRoleManager(config, self.multi_model_client)
 
@@ -731,19 +785,20 @@ class OutlineGenerator:
 
     def _load_existing_skeletons(self) -> Dict[str, Any]:
         """加载已存在的大纲"""
-        if self.skeletons_file.exists():
-            try:
-                with open(self.skeletons_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.warning(f"加载骨架文件失败: {e}")
+        try:
+            return json_loads(self.skeletons_file.read_bytes())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"加载骨架文件失败: {e}")
         return {}
 
     def _save_skeletons(self, skeletons: Dict[str, Any]) -> bool:
         """保存章级骨架"""
         try:
-            with open(self.skeletons_file, "w", encoding="utf-8") as f:
-                json.dump(skeletons, f, ensure_ascii=False, indent=2)
+            atomic_write_text(
+                self.skeletons_file, json_dumps(skeletons)
+            )
             self.logger.info(f"大纲已保存: {self.skeletons_file}")
             return True
         except Exception as e:
@@ -847,10 +902,10 @@ class OutlineGenerator:
 
     def _extract_chapter_number(self, chapter_key: str) -> int:
         """从章节键提取章节号"""
-        matched = re.search(r"(\d+)", str(chapter_key))
-        if matched:
-            return int(matched.group(1))
-        return 0
+        matched = _DIGITS_RE.search(
+            chapter_key if isinstance(chapter_key, str) else str(chapter_key)
+        )
+        return int(matched.group()) if matched else 0
 
     # ==================== 辅助方法 ====================
 
@@ -906,9 +961,9 @@ class OutlineGenerator:
         try:
             cleaned_response = self._clean_markdown_response(response)
 
-            self.logger.debug(f"清理后的响应前500字符: {cleaned_response[:500]}")
+            self.logger.debug("清理后的响应前500字符: %s", cleaned_response[:500])
 
-            outline = yaml.safe_load(cleaned_response)
+            outline = yaml_load(cleaned_response)
 
             if isinstance(outline, str):
                 self.logger.warning("YAML解析返回字符串，尝试简单文本解析")
@@ -938,35 +993,19 @@ class OutlineGenerator:
 
     def _clean_markdown_response(self, response: str) -> str:
         """清理Markdown格式的响应"""
-        # 移除markdown代码块标记
-        lines = response.split("\n")
-        cleaned_lines = []
-
-        for line in lines:
-            stripped = line.strip()
-            # 跳过代码块开始和结束标记（```json, ```yaml, ```, etc.）
-            if stripped.startswith("```"):
-                continue
-            cleaned_lines.append(line)
-
-        return "\n".join(cleaned_lines)
+        # 移除代码块开始和结束标记（```json, ```yaml, ```, etc.）
+        return _CODE_FENCE_LINE_RE.sub("", response)
 
     def _simple_parse(self, response: str) -> Dict[str, Any]:
         outline = {}
-        lines = response.strip().split("\n")
         current_chapter = None
 
-        for line in lines:
-            stripped = line.strip()
-
-            chapter_match = re.match(r"^第\s*(\d+)\s*章\s*[:：]?\s*(.*)$", stripped)
-            if chapter_match:
-                chapter_num = chapter_match.group(1)
+        for matched in _SIMPLE_LINE_RE.finditer(response):
+            chapter_num = matched.group("chapter")
+            if chapter_num is not None:
                 current_chapter = f"第{chapter_num}章"
                 outline[current_chapter] = {
-                    "标题": chapter_match.group(2).strip()
-                    if chapter_match.group(2)
-                    else f"第{chapter_num}章",
+                    "标题": matched.group("title") or current_chapter,
                     "核心事件": "",
                     "场景": "",
                     "人物行动": "",
@@ -975,27 +1014,19 @@ class OutlineGenerator:
                 }
                 continue
 
-            if current_chapter and stripped:
-                if stripped.startswith("- "):
-                    stripped = stripped[2:]
+            if current_chapter:
+                field_name = matched.group("field")
+                field_value = matched.group("value")
 
-                field_match = re.match(
-                    r"^(标题|核心事件|场景|人物行动|伏笔回收|字数目标|目标字数|字数)[:：]\s*(.*)$",
-                    stripped,
-                )
-                if field_match:
-                    field_name = field_match.group(1)
-                    field_value = field_match.group(2).strip()
-
-                    if field_name in ["目标字数", "字数"]:
-                        field_name = "字数目标"
-                        num_match = re.search(r"\d+", str(field_value))
-                        if num_match:
-                            field_value = int(num_match.group())
-                        else:
-                            field_value = 1500
+                if field_name in ("目标字数", "字数"):
+                    field_name = "字数目标"
+                    num_match = _DIGITS_RE.search(field_value)
+                    if num_match:
+                        field_value = int(num_match.group())
+                    else:
+                        field_value = 1500
 
-                    outline[current_chapter][field_name] = field_value
+                outline[current_chapter][field_name] = field_value
 
         if not outline:
             self.logger.warning(
@@ -1006,56 +1037,20 @@ class OutlineGenerator:
 
     def _validate_outline(self, outline: Dict[str, Any]):
         """验证大纲格式"""
-        required_fields = [
-            "标题",
-            "核心事件",
-            "场景",
-            "人物行动",
-            "伏笔回收",
-            "字数目标",
-        ]
-
         for chapter, content in outline.items():
             if not isinstance(content, dict):
                 raise ValueError(f"章节 {chapter} 内容格式错误")
 
-            for field in required_fields:
-                # 检查字段是否存在
-                if field not in content:
-                    # 检查字段变体
-                    if field == "字数目标":
-                        # 检查可能的变体
-                        if "字数目标" in content:
-                            content["字数目标"] = content.pop("字数目标")
-                        elif "目标字数" in content:
-                            content["字数目标"] = content.pop("目标字数")
-                        elif "字数" in content:
-                            content["字数目标"] = content.pop("字数")
-                        else:
-                            # 如果没有找到任何变体，设置默认值
-                            content["字数目标"] = "1500字左右"
-                    elif field == "伏笔回收":
-                        # 伏笔回收可以是可选的，如果没有则设置为"无"
-                        if "伏笔回收" not in content:
-                            content["伏笔回收"] = "无"
-                    else:
-                        # 检查是否有相似的字段
-                        similar_fields = [
-                            k for k in content.keys() if field in k or k in field
-                        ]
-                        if similar_fields:
-                            # 使用相似字段
-                            content[field] = content.pop(similar_fields[0])
-                        else:
-                            # 如果没有找到相似字段，设置默认值
-                            if field == "标题":
-                                content["标题"] = "未命名章节"
-                            elif field == "核心事件":
-                                content["核心事件"] = "待定"
-                            elif field == "场景":
-                                content["场景"] = "待定"
-                            elif field == "人物行动":
-                                content["人物行动"] = "待定"
+            for field, default in _OUTLINE_FIELD_DEFAULTS.items():
+                if field in content:
+                    continue
+                # 先找已知别名，再（对允许的字段）找名称相近的字段，都没有则填默认值
+                source = next(
+                    (k for k in _OUTLINE_FIELD_ALIASES.get(field, ()) if k in content), None
+                )
+                if source is None and field in _OUTLINE_FUZZY_FIELDS:
+                    source = next((k for k in content if field in k or k in field), None)
+                content[field] = content.pop(source) if source is not None else default
 
     def save_outline(
         self, outline: Dict[str, Any], output_path: str, backup: bool = True
@@ -1086,8 +1081,10 @@ class OutlineGenerator:
                 self.logger.info(f"备份现有大纲文件: {backup_path}")
 
             # 保存新文件
-            with open(output_file, "w", encoding="utf-8") as f:
-                yaml.dump(outline, f, default_flow_style=False, allow_unicode=True)
+            atomic_write_text(
+                output_file,
+                yaml_dump(outline, default_flow_style=False, allow_unicode=True),
+            )
 
             self.logger.info(f"大纲文件保存成功: {output_file}")
             return str(output_file)
@@ -1116,8 +1113,7 @@ class OutlineGenerator:
             Dict[str, Any]: 大纲内容
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                outline = yaml.safe_load(f)
+            outline = load_outline_file(Path(file_path))
 
             self.logger.info(f"大纲文件加载成功: {file_path}")
             return outline
@@ -1134,6 +1130,7 @@ class OutlineGenerator:
         """
         try:
             self.logger.info("开始优化大纲...")
+            core_setting = normalize_core_setting(core_setting)
 
             fixed_count = 0
             for chapter, content in outline.items():
@@ -1174,10 +1171,11 @@ class OutlineGenerator:
         self, outline: Dict[str, Any], core_setting: Dict[str, Any]
     ) -> Dict[str, Any]:
         """检查人物一致性"""
-        characters = core_setting.get("人物小传", {})
         known_names = [
-            str(name).strip() for name in characters.keys() if str(name).strip()
+            name for name in (str(n).strip() for n in core_setting.get("人物小传", {})) if name
         ]
+        if not known_names:
+            return outline
 
         for chapter, content in outline.items():
             chapter_text = " ".join(
@@ -1187,9 +1185,6 @@ class OutlineGenerator:
                     str(content.get("伏笔回收", "")),
                 ]
             )
-            if not known_names:
-                continue
-
             mentioned = [name for name in known_names if name in chapter_text]
             if not mentioned:
                 content["一致性提示"] = "未检测到核心人物，建议补充人物行为与动机"
@@ -1204,30 +1199,22 @@ class OutlineGenerator:
         self, outline: Dict[str, Any], core_setting: Dict[str, Any]
     ) -> Dict[str, Any]:
         """检查伏笔连贯性"""
-        foreshadowing_plan = core_setting.get("伏笔清单", [])
         planned_keywords: List[str] = []
-        if isinstance(foreshadowing_plan, list):
-            for item in foreshadowing_plan:
-                text = str(item).strip()
-                if text:
-                    planned_keywords.append(text[:18])
+        for item in core_setting.get("伏笔清单", []):
+            text = str(item).strip()
+            if text:
+                planned_keywords.append(text[:18])
 
         seen: Dict[str, int] = {}
         for _, content in outline.items():
             raw_value = str(content.get("伏笔回收", "")).strip()
             if not raw_value or raw_value == "无":
                 continue
-            tokens = [
-                token.strip()
-                for token in re.split(r"[,，；;、]", raw_value)
-                if token.strip()
+            normalized_tokens = [
+                token[:18]
+                for token in map(str.strip, _FORESHADOW_SPLIT_RE.split(raw_value))
+                if token
             ]
-            normalized_tokens = []
-            for token in tokens:
-                if len(token) > 18:
-                    normalized_tokens.append(token[:18])
-                else:
-                    normalized_tokens.append(token)
             for token in normalized_tokens:
                 seen[token] = seen.get(token, 0) + 1
             duplicate = [token for token in normalized_tokens if seen.get(token, 0) > 2]
@@ -1269,16 +1256,14 @@ class OutlineGenerator:
     def _extract_target_word_count(self, raw_value: Any) -> int:
         if isinstance(raw_value, int):
             return raw_value
-        matched = re.search(r"(\d+)", str(raw_value))
-        if matched:
-            return int(matched.group(1))
-        return 1500
+        matched = _DIGITS_RE.search(
+            raw_value if isinstance(raw_value, str) else str(raw_value)
+        )
+        return int(matched.group()) if matched else 1500
 
     def _load_core_setting(self) -> Dict[str, Any]:
         try:
             core_setting_path = Path(self.settings.path_config.core_setting_file)
-            with open(core_setting_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                return data if isinstance(data, dict) else {}
+            return normalize_core_setting(load_yaml_file(core_setting_path, default={}))
         except Exception:
-            return {}
+            return normalize_core_setting({})
@@ -9,7 +9,7 @@ from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class SatisfactionElement:
     """爽点元素定义"""
     name: str
@@ -18,7 +18,7 @@ class SatisfactionElement:
     weight: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class SatisfactionResult:
     """爽点检查结果"""
     passed: bool
@@ -3,14 +3,16 @@
 负责多小说项目的创建、管理和切换
 """
 
-import json
 import os
+import re
 import uuid
 import shutil
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from novel_generator.utils.file_handler import atomic_write_text, json_dumps, json_loads
+
 
 class NovelProject:
     """单个小说项目"""
@@ -43,14 +45,15 @@ class NovelProject:
             (self.logs_dir / "ai_api_logs").mkdir(exist_ok=True)
             (self.logs_dir / "system_logs").mkdir(exist_ok=True)
 
-            # 初始化 novel.json (元数据)
+            # 初始化 novel.json (元数据)，创建与更新时间取同一时刻
+            now = datetime.now().isoformat()
             novel_config = {
                 "novel_id": self.novel_id,
                 "name": name,
                 "description": description,
                 "api_config_ref": api_config_ref,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
             }
             self.save_config(novel_config)
 
@@ -800,21 +803,18 @@ single_chapter:
 
     def _load_json(self, file_path: Path) -> Dict[str, Any]:
         """加载JSON文件"""
-        if not file_path.exists():
-            return {}
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data: Dict[str, Any] = json.load(f)
-                return data
+            data: Dict[str, Any] = json_loads(file_path.read_bytes())
+            return data
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             raise Exception(f"读取JSON文件失败 {file_path}: {e}")
 
     def _save_json(self, file_path: Path, data: Dict) -> bool:
         """保存JSON文件"""
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            atomic_write_text(file_path, json_dumps(data))
             return True
         except Exception as e:
             raise Exception(f"保存JSON文件失败 {file_path}: {e}")
@@ -892,8 +892,6 @@ class NovelManager:
         short_uuid = uuid.uuid4().hex[:8]
 
         # 尝试从名称生成slug
-        import re
-
         # 移除非字母数字字符，保留中文
         slug = re.sub(r'[^\w一-鿿]+', '-', name).strip('-')
         if len(slug) > 20:
@@ -1010,8 +1008,7 @@ class NovelManager:
 
         try:
             current_file = self.novels_dir / self.CURRENT_FILE
-            with open(current_file, "w", encoding="utf-8") as f:
-                f.write(novel_id)
+            atomic_write_text(current_file, novel_id)
             return True
         except Exception as e:
             raise Exception(f"设置当前小说失败: {e}")
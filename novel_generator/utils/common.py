@@ -5,12 +5,26 @@
 """
 
 import os
+import re
 import sys
-import json
+import copy
 import yaml
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+from novel_generator.utils.file_handler import (
+    atomic_write_text, ensure_dir, json_loads, read_text_auto, yaml_load, yaml_dump
+)
+
+
+# 大纲键中的章节号（"第X章" 或纯数字）
+_CHAPTER_KEY_RE = re.compile(r'第?(\d+)章?')
+# get_chapter_data 支持的完整键名格式，分组顺序即查找优先级
+_EXACT_CHAPTER_KEY_RE = re.compile(r'^(?:第(\d+)章|(\d+)|Chapter (\d+))$')
+
+# YAML 解析缓存：路径 -> ((mtime_ns, size), 内容)，文件变更后自动失效
+_yaml_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
 
 
 def get_project_root() -> Path:
@@ -200,9 +214,18 @@ def load_yaml_file(file_path: Path, default: Optional[Dict] = None) -> Dict[str,
                 return default
             raise FileNotFoundError(f"文件不存在: {file_path}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = yaml.safe_load(f)
-            return content if content is not None else (default or {})
+        stat = file_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cache_key = str(file_path.resolve())
+        cached = _yaml_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            content = cached[1]
+        else:
+            content = yaml_load(read_text_auto(file_path))
+            _yaml_cache[cache_key] = (signature, content)
+
+        # 返回副本，调用方修改不会污染缓存
+        return copy.deepcopy(content) if content is not None else (default or {})
 
     except yaml.YAMLError as e:
         logging.error(f"YAML解析错误 {file_path}: {e}")
@@ -217,6 +240,42 @@ def load_yaml_file(file_path: Path, default: Optional[Dict] = None) -> Dict[str,
         raise
 
 
+def load_outline_file(file_path: Path, default: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    加载大纲文件
+
+    outline.json 直接用 json 解析（C 实现，远快于把 JSON 当 YAML 解析）；
+    其他格式走带缓存的 load_yaml_file
+
+    Args:
+        file_path: 大纲文件路径
+        default: 加载失败时返回的默认值
+
+    Returns:
+        Dict[str, Any]: 大纲字典
+    """
+    file_path = Path(file_path)
+    if file_path.suffix.lower() != ".json":
+        return load_yaml_file(file_path, default=default)
+
+    try:
+        try:
+            # 一次读入字节直接交给 json 解码，省去 exists() 和文本层的二次拷贝
+            raw = file_path.read_bytes()
+        except FileNotFoundError:
+            if default is not None:
+                return default
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+
+        content = json_loads(raw)
+        return content if content is not None else (default or {})
+    except Exception as e:
+        logging.error(f"加载大纲文件失败 {file_path}: {e}")
+        if default is not None:
+            return default
+        raise
+
+
 def validate_project_structure(
     project_root: Optional[Path] = None,
     required_files: Optional[List[str]] = None,
@@ -301,12 +360,15 @@ def find_outline_files(project_root: Optional[Path] = None) -> List[Path]:
     if not outline_dir or not outline_dir.exists():
         return []
 
-    # 查找YAML、JSON和TXT文件
-    yaml_files = list(outline_dir.glob("chapter_outline_*.yaml"))
-    json_files = list(outline_dir.glob("*.json"))
-    txt_files = list(outline_dir.glob("*.txt"))
-
-    return sorted(yaml_files + json_files + txt_files)
+    # 查找YAML、JSON和TXT文件（一次目录扫描）
+    with os.scandir(outline_dir) as entries:
+        outline_files = sorted(
+            outline_dir / entry.name
+            for entry in entries
+            if entry.name.endswith((".json", ".txt"))
+            or (entry.name.startswith("chapter_outline_") and entry.name.endswith(".yaml"))
+        )
+    return outline_files
 
 
 def get_latest_outline_file(project_root: Optional[Path] = None) -> Optional[Path]:
@@ -333,8 +395,7 @@ def ensure_directories(project_root: Optional[Path] = None) -> None:
     if project_root is None:
         project_root = get_project_root()
 
-    novels_dir = get_novels_dir(project_root)
-    novels_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(get_novels_dir(project_root))
 
 
 def load_core_setting(project_root: Optional[Path] = None) -> Dict[str, Any]:
@@ -350,7 +411,6 @@ def load_core_setting(project_root: Optional[Path] = None) -> Dict[str, Any]:
     Raises:
         FileNotFoundError: 当小说路径未配置或设定文件不存在时
     """
-    import logging
     logger = logging.getLogger(__name__)
 
     if project_root is None:
@@ -370,6 +430,72 @@ def load_core_setting(project_root: Optional[Path] = None) -> Dict[str, Any]:
     if not data:
         logger.warning(f"核心设定文件为空: {setting_path}")
 
+    return normalize_core_setting(data)
+
+
+def _normalize_character_info(info: Any) -> Any:
+    """人物信息统一为 dict 或 str：空值为 dict，列表拼接为文本，其余标量转为文本"""
+    if info is None:
+        return {}
+    if isinstance(info, (dict, str)):
+        return info
+    if isinstance(info, list):
+        return "；".join(str(item) for item in info if item is not None)
+    return str(info)
+
+
+def normalize_core_setting(data: Any) -> Dict[str, Any]:
+    """
+    规范化核心设定结构（加载时执行一次，后续使用处无需再做类型判断）
+
+    - 人物小传 统一为 dict，每个人物信息为 dict 或 str
+    - 伏笔清单 统一为 list
+    - 设定禁忌 为空时统一为 list
+
+    无法识别的内容尽量转为文本保留，不静默丢弃。
+
+    Args:
+        data: 原始核心设定
+
+    Returns:
+        Dict[str, Any]: 规范化后的核心设定（必有 人物小传/伏笔清单/设定禁忌 三项）
+    """
+    if not isinstance(data, dict):
+        if data is not None:
+            logging.warning(f"核心设定应为字典，实际为 {type(data).__name__}，已忽略该内容")
+        data = {}
+
+    characters = data.get("人物小传")
+    if isinstance(characters, dict):
+        data["人物小传"] = {
+            name: _normalize_character_info(info) for name, info in characters.items()
+        }
+    elif isinstance(characters, list):
+        # 列表项可以是人物名，也可以是 "- 林凡: 外门弟子" 这样的单项映射
+        normalized: Dict[str, Any] = {}
+        for item in characters:
+            if isinstance(item, dict):
+                for name, info in item.items():
+                    normalized[str(name)] = _normalize_character_info(info)
+            elif item:
+                normalized[str(item)] = {}
+        data["人物小传"] = normalized
+    elif characters is None:
+        data["人物小传"] = {}
+    else:
+        data["人物小传"] = {str(characters): {}}
+
+    foreshadowing = data.get("伏笔清单")
+    if isinstance(foreshadowing, dict):
+        data["伏笔清单"] = [f"{k}: {v}" if v else str(k) for k, v in foreshadowing.items()]
+    elif foreshadowing is None:
+        data["伏笔清单"] = []
+    elif not isinstance(foreshadowing, list):
+        data["伏笔清单"] = [str(foreshadowing)]
+
+    if data.get("设定禁忌") is None:
+        data["设定禁忌"] = []
+
     return data
 
 
@@ -423,10 +549,16 @@ def save_yaml_file(file_path: Path, data: Dict[str, Any]) -> None:
         file_path: 目标文件路径
         data: 要保存的字典数据
     """
-    file_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(
+        file_path,
+        yaml_dump(data, allow_unicode=True, sort_keys=False, default_flow_style=False),
+    )
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+    # 写穿缓存：随后的 load_yaml_file 直接命中，无需重新解析刚写入的文件
+    stat = file_path.stat()
+    _yaml_cache[str(file_path.resolve())] = (
+        (stat.st_mtime_ns, stat.st_size), copy.deepcopy(data)
+    )
 
 
 def parse_chapter_range(outline_data: Dict[str, Any]) -> tuple[int, int]:
@@ -439,14 +571,14 @@ def parse_chapter_range(outline_data: Dict[str, Any]) -> tuple[int, int]:
     Returns:
         tuple[int, int]: (起始章节, 结束章节)
     """
-    import re
-
-    chapters = []
-    for key in outline_data.keys():
-        # 支持 "第X章" 格式
-        match = re.search(r'第?(\d+)章?', str(key))
-        if match:
-            chapters.append(int(match.group(1)))
+    # 支持 "第X章" 格式
+    search = _CHAPTER_KEY_RE.search
+    chapters = [
+        int(match.group(1))
+        for match in (search(key if isinstance(key, str) else str(key))
+                      for key in outline_data)
+        if match
+    ]
 
     if not chapters:
         return 1, 1
@@ -467,17 +599,54 @@ def format_chapter_key(chapter_num: int) -> str:
     return f"第{chapter_num}章"
 
 
-def get_chapter_data(outline_data: Dict[str, Any], chapter_num: int) -> Optional[Dict[str, Any]]:
+def build_chapter_key_index(outline_data: Dict[str, Any]) -> Dict[int, str]:
+    """
+    构建 章节号 -> 大纲键名 索引（遍历一次大纲）
+
+    同一章节存在多种键名时，按 get_chapter_data 的优先级取
+    "第X章" > "X" > "Chapter X"
+
+    Args:
+        outline_data: 大纲字典
+
+    Returns:
+        Dict[int, str]: 章节号到键名的映射
+    """
+    index: Dict[int, str] = {}
+    ranks: Dict[int, int] = {}
+    match_key = _EXACT_CHAPTER_KEY_RE.match
+    for key in outline_data:
+        match = match_key(key) if isinstance(key, str) else None
+        if not match:
+            continue
+        rank = match.lastindex
+        chapter_num = int(match.group(rank))
+        if rank < ranks.get(chapter_num, 4):
+            ranks[chapter_num] = rank
+            index[chapter_num] = key
+    return index
+
+
+def get_chapter_data(
+    outline_data: Dict[str, Any],
+    chapter_num: int,
+    key_index: Optional[Dict[int, str]] = None,
+) -> Optional[Dict[str, Any]]:
     """
     获取指定章节的数据
 
     Args:
         outline_data: 大纲字典
         chapter_num: 章节号
+        key_index: build_chapter_key_index 构建的索引（可选，循环中逐章查找时传入）
 
     Returns:
         Optional[Dict]: 章节数据，未找到返回None
     """
+    if key_index is not None:
+        key = key_index.get(chapter_num)
+        return outline_data[key] if key is not None else None
+
     # 尝试多种键名格式
     keys_to_try = [
         format_chapter_key(chapter_num),
@@ -10,6 +10,257 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import shutil
+import tempfile
+
+# 优先使用 libyaml 的 C 实现（解析/序列化快 5-10 倍），未编译时回退纯 Python 版本
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as _SafeDumperBase
+except ImportError:  # pragma: no cover - 取决于 PyYAML 的构建方式
+    from yaml import SafeLoader as YamlLoader, SafeDumper as _SafeDumperBase
+
+
+class YamlDumper(_SafeDumperBase):
+    """安全序列化器：元组按列表写出（安全加载器本就读不回 !!python/tuple 标签）"""
+
+
+YamlDumper.add_representer(tuple, yaml.representer.SafeRepresenter.represent_list)
+
+
+# 安装了 orjson 时用它解析/序列化 JSON（快 2-5 倍），否则回退标准库
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """解析JSON（等价于 json.loads，解析失败抛出 json.JSONDecodeError）"""
+    if orjson is None:
+        return json.loads(data)
+    if isinstance(data, bytes) and data.startswith(_UTF8_BOM):
+        data = data[len(_UTF8_BOM):]
+    elif isinstance(data, str) and data.startswith("\ufeff"):
+        data = data[1:]
+    return orjson.loads(data)
+
+
+def json_dumps(data: Any, indent: bool = True) -> str:
+    """
+    序列化为JSON字符串（格式同 json.dumps(ensure_ascii=False, indent=2)）
+
+    使用 orjson 时与标准库有两处差异：浮点数的指数写法不同（1e16 而非 1e+16，
+    解析后数值相同）；NaN/Infinity 写成 null 而非 NaN/Infinity。
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, option=option).decode("utf-8")
+        except TypeError:
+            # orjson 不支持的类型（超大整数、孤立代理字符等）交给标准库处理
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None)
+
+
+def yaml_load(stream: Any) -> Any:
+    """解析YAML（等价于 yaml.safe_load）"""
+    return yaml.load(stream, Loader=YamlLoader)
+
+
+def yaml_dump(data: Any, **kwargs: Any) -> str:
+    """
+    序列化为YAML字符串（参数同 yaml.dump）
+
+    字符串、数字、布尔、None、列表、元组（写成列表）和字典走安全序列化器，
+    输出与 yaml.dump 一致；含其他 Python 对象时安全序列化器拒绝处理，
+    回退到 yaml.dump 的默认 Dumper，保持原有写出行为。
+    """
+    try:
+        return yaml.dump(data, Dumper=YamlDumper, **kwargs)
+    except yaml.representer.RepresenterError:
+        return yaml.dump(data, **kwargs)
+
+
+# 编码探测只取文件开头这么多字节，小说素材文本足以判断
+DETECT_SAMPLE_BYTES = 64 * 1024
+# chardet 逐行探测时最多喂入的行数
+DETECT_SAMPLE_LINES = 200
+
+# 带 BOM 的 UTF-16（记事本“Unicode”格式）可以直接判断，无需探测
+_UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+# 探测器常把 GBK 文本报成 GB2312（样本里恰好没有 GB2312 以外的字），按其报告
+# 解码会在后文出错、再整篇重解一遍；直接换成兼容的超集。样本全是 ASCII 而全文又
+# 不是 UTF-8 时，非 ASCII 部分按中文素材最常见的 GB18030 处理
+_ENCODING_SUPERSETS = {
+    "ascii": "gb18030",
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+}
+
+_encoding_detector = None
+
+
+def _get_encoding_detector():
+    """按需加载编码探测器：优先 cchardet（C 实现），其次 charset_normalizer，最后 chardet"""
+    global _encoding_detector
+    if _encoding_detector is None:
+        try:
+            import cchardet
+
+            def _detect_cchardet(raw: bytes) -> Optional[str]:
+                return cchardet.detect(raw).get("encoding")
+
+            _encoding_detector = _detect_cchardet
+        except ImportError:
+            try:
+                from charset_normalizer import from_bytes
+
+                def _detect(raw: bytes) -> Optional[str]:
+                    best = from_bytes(raw).best()
+                    return best.encoding if best else None
+
+                _encoding_detector = _detect
+            except ImportError:
+                from chardet.universaldetector import UniversalDetector
+
+                def _detect_chardet(raw: bytes) -> Optional[str]:
+                    return _detect_by_lines(UniversalDetector(), raw)
+
+                _encoding_detector = _detect_chardet
+    return _encoding_detector
+
+
+def _detect_by_lines(detector: Any, raw: bytes) -> Optional[str]:
+    """逐行喂给 chardet 的 UniversalDetector，置信度足够时提前结束"""
+    for line in raw.splitlines(keepends=True)[:DETECT_SAMPLE_LINES]:
+        detector.feed(line)
+        if detector.done:
+            break
+    detector.close()
+    result = detector.result
+    if result.get("confidence", 0) <= 0.9:
+        return None
+    return result.get("encoding")
+
+
+def detect_encoding(raw: bytes) -> str:
+    """
+    探测字节内容的编码
+
+    Args:
+        raw: 文件内容（只取开头 DETECT_SAMPLE_BYTES 字节参与探测）
+
+    Returns:
+        str: 编码名称，探测失败时返回 gb18030
+    """
+    if raw.startswith(_UTF16_BOMS):
+        return "utf-16"
+    try:
+        encoding = _get_encoding_detector()(raw[:DETECT_SAMPLE_BYTES])
+    except ImportError:
+        encoding = None
+    if not encoding:
+        return "gb18030"
+    return _ENCODING_SUPERSETS.get(encoding.lower().replace("-", "").replace("_", ""), encoding)
+
+
+def read_text_auto(file_path: Union[str, Path]) -> str:
+    """
+    读取文本文件并自动识别编码（兼容记事本保存的 GBK 素材）
+
+    UTF-8 文件直接解码返回，不做编码探测。探测到的编码解码失败时改用 GB18030，
+    仍失败则抛出 UnicodeDecodeError，不会把无法识别的字节替换成乱码。
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        str: 文件内容
+
+    Raises:
+        UnicodeDecodeError: 文件内容无法按探测到的编码或 GB18030 解码
+    """
+    raw = Path(file_path).read_bytes()
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        pass
+    encoding = detect_encoding(raw)
+    try:
+        return raw.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return raw.decode("gb18030")
+
+
+# 本进程内已确认存在的目录，避免每次写文件都重复 mkdir
+_ensured_dirs: set = set()
+
+
+def ensure_dir(dir_path: Union[str, Path]) -> Path:
+    """
+    确保目录存在；同一进程内每个目录只创建一次
+
+    Args:
+        dir_path: 目录路径
+
+    Returns:
+        Path: 目录路径
+    """
+    path = Path(dir_path)
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
+
+
+# 新建文件的默认权限（同 open(..., "w")：0o666 去掉 umask）。umask 只能"设置并取回"，
+# 在导入时读取一次，避免多线程写文件时临时改动进程 umask
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+def atomic_write_text(file_path: Union[str, Path], content: str,
+                      encoding: str = "utf-8") -> None:
+    """
+    原子写入文本文件（同目录临时文件 + os.replace），中断时不会留下半截文件
+
+    Args:
+        file_path: 目标文件路径
+        content: 文本内容
+        encoding: 编码
+    """
+    path = Path(file_path)
+    ensure_dir(path.parent)
+    data = content.encode(encoding)
+
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    except FileNotFoundError:
+        # 目录在运行期间被删除，丢弃缓存后重建
+        _ensured_dirs.discard(path.parent)
+        ensure_dir(path.parent)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 默认权限为 0600：替换时沿用原文件权限，新文件按 umask 计算
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = _NEW_FILE_MODE
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
 
 
 class FileHandler:
@@ -37,7 +288,7 @@ class FileHandler:
         try:
             full_path = self.base_path / file_path
             with open(full_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml_load(f)
         except Exception as e:
             raise Exception(f"读取YAML文件失败 {file_path}: {e}")
     
@@ -66,8 +317,10 @@ class FileHandler:
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
             # 写入文件
-            with open(full_path, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+            atomic_write_text(
+                full_path,
+                yaml_dump(data, default_flow_style=False, allow_unicode=True),
+            )
             
             return str(full_path)
             
@@ -116,8 +369,7 @@ class FileHandler:
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
             # 写入文件
-            with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            atomic_write_text(full_path, json_dumps(data))
             
             return str(full_path)
             
@@ -136,8 +388,7 @@ class FileHandler:
         """
         try:
             full_path = self.base_path / file_path
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return read_text_auto(full_path)
         except Exception as e:
             raise Exception(f"读取文本文件失败 {file_path}: {e}")
     
@@ -166,8 +417,7 @@ class FileHandler:
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
             # 写入文件
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            atomic_write_text(full_path, content)
             
             return str(full_path)
             
@@ -6,11 +6,17 @@
 import logging
 import json
 import os
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from logging.handlers import RotatingFileHandler
 
+from novel_generator.utils.file_handler import json_dumps
+
+# 内存中保留的最近操作记录条数，超出后自动淘汰最早的记录
+OPERATION_HISTORY_LIMIT = 1000
+
 
 class NovelLogger:
     """小说创作日志管理器"""
@@ -39,7 +45,7 @@ class NovelLogger:
         self.api_logger = self._setup_api_logger()
         
         # 操作历史记录
-        self.operation_history = []
+        self.operation_history: deque = deque(maxlen=OPERATION_HISTORY_LIMIT)
         
     def _setup_system_logger(self) -> logging.Logger:
         """设置系统日志记录器"""
@@ -120,12 +126,8 @@ class NovelLogger:
             # 记录到系统日志
             self.system_logger.info(f"操作: {operation} - 详情: {json.dumps(details, ensure_ascii=False)}")
             
-            # 添加到操作历史
+            # 添加到操作历史（deque 定长，超出上限自动淘汰最早的记录）
             self.operation_history.append(log_entry)
-            
-            # 限制历史记录数量
-            if len(self.operation_history) > 1000:
-                self.operation_history = self.operation_history[-500:]
                 
         except Exception as e:
             self.system_logger.error(f"记录操作日志失败: {e}")
@@ -238,7 +240,7 @@ class NovelLogger:
             List[Dict[str, Any]]: 操作历史记录
         """
         try:
-            filtered_history = self.operation_history
+            filtered_history = list(self.operation_history)
             
             # 按操作名称过滤
             if operation:
@@ -362,10 +364,10 @@ class NovelLogger:
             
             # 清理操作历史
             cutoff_datetime = datetime.fromtimestamp(cutoff_time).isoformat()
-            self.operation_history = [
-                h for h in self.operation_history 
-                if h['timestamp'] >= cutoff_datetime
-            ]
+            self.operation_history = deque(
+                (h for h in self.operation_history if h['timestamp'] >= cutoff_datetime),
+                maxlen=OPERATION_HISTORY_LIMIT,
+            )
             
         except Exception as e:
             self.system_logger.error(f"清理旧日志失败: {e}")
@@ -383,7 +385,7 @@ class NovelLogger:
                 'export_time': datetime.now().isoformat(),
                 'system_logs': [],
                 'api_logs': [],
-                'operation_history': self.operation_history
+                'operation_history': list(self.operation_history)
             }
             
             # 导出系统日志
@@ -398,9 +400,8 @@ class NovelLogger:
                     with open(self.api_log_file, 'r', encoding='utf-8') as f:
                         export_data['api_logs'] = f.readlines()
             
-            # 保存到文件
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            # 保存到文件（导出内容含完整日志，可能很大，走 orjson 序列化）
+            Path(output_file).write_text(json_dumps(export_data), encoding='utf-8')
             
             self.system_logger.info(f"日志导出成功: {output_file}")
             
@@ -6,28 +6,162 @@
 import os
 import json
 import time
+import hashlib
 import random
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime
-import requests
+from types import MappingProxyType
 from pathlib import Path
 
-try:
-    from volcenginesdkarkruntime import Ark
-
-    ARK_AVAILABLE = True
-except ImportError:
-    ARK_AVAILABLE = False
-
-try:
-    from openai import OpenAI
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# 只探测是否安装，不在导入本模块时加载 SDK（openai 导入耗时约 0.5 秒），
+# 实际构造客户端时再导入
+ARK_AVAILABLE = find_spec("volcenginesdkarkruntime") is not None
+OPENAI_AVAILABLE = find_spec("openai") is not None
+# 安装了 h2 时连接池走 HTTP/2，并发请求复用同一条 TLS 连接
+HTTP2_AVAILABLE = find_spec("h2") is not None
 
 from novel_generator.config.settings import Settings
+from novel_generator.utils.file_handler import atomic_write_text, json_dumps, json_loads
+
+
+# 各服务商默认模型（只读，实例化时按需复制）
+DEFAULT_MODEL_MAPPING = MappingProxyType({
+    "doubao": MappingProxyType({
+        "logic_analysis_model": "doubao-seed-2-0-lite-260215",
+        "major_chapters_model": "doubao-seed-2-0-lite-260215",
+        "sub_chapters_model": "doubao-seed-2-0-lite-260215",
+        "expansion_model": "doubao-seed-2-0-lite-260215",
+    }),
+    "deepseek": MappingProxyType({
+        "logic_analysis_model": "deepseek-chat",
+        "major_chapters_model": "deepseek-chat",
+        "sub_chapters_model": "deepseek-chat",
+        "expansion_model": "deepseek-chat",
+    }),
+})
+
+# 生成阶段 -> 模型配置键
+STAGE_MODEL_KEYS = MappingProxyType({
+    "stage1": "logic_analysis_model",
+    "stage2": "major_chapters_model",
+    "stage3": "sub_chapters_model",
+    "stage4": "expansion_model",
+    "stage5": "expansion_model",
+    "default": "expansion_model",
+})
+
+# 同时在途的 API 请求上限（可用 system.api.concurrency 覆盖）
+DEFAULT_CONCURRENCY = 4
+
+# 默认限流：平均每秒 1 次请求，不允许突发（可用 system.api.requests_per_second / burst 覆盖）
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_BURST = 1
+
+# 流式响应首个数据块前中断时，重试退避的上限（秒）
+STREAM_RETRY_MAX_DELAY = 60.0
+
+
+class TokenBucket:
+    """令牌桶限流器（线程安全）
+
+    令牌按 rate 个/秒补充，最多积攒 capacity 个。空闲一段时间后可以连续发出
+    capacity 个请求，之后按 rate 匀速放行；令牌不足时预支，各线程按顺序排队等待。
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate 必须大于 0")
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """取走一个令牌，返回调用方还需等待的秒数（0 表示可立即发送）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def pause(self, seconds: float) -> None:
+        """清空令牌，seconds 秒后才恢复放行（服务商返回 429 时让所有排队线程一起退避）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens = min(self._tokens, 1.0) - seconds * self.rate
+
+    def acquire(self) -> float:
+        """阻塞直到拿到令牌，返回实际等待的秒数"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def _make_http_client(api_cfg: Dict[str, Any]):
+    """
+    构造 OpenAI SDK 使用的 httpx 连接池
+
+    连接数与并发额度一致，空闲连接保持复用；可用时启用 HTTP/2 多路复用
+    """
+    import httpx
+    from openai import DefaultHttpxClient
+
+    concurrency = max(1, api_cfg.get("concurrency", DEFAULT_CONCURRENCY))
+    return DefaultHttpxClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ),
+    )
+
+
+def _rate_limit_cooldown(error: Exception, default: float) -> Optional[float]:
+    """
+    判断异常是否为服务商限流（HTTP 429），是则返回建议的冷却秒数
+
+    优先使用响应头 Retry-After，没有时使用 default；不是 429 返回 None
+    """
+    if getattr(error, "status_code", None) != 429:
+        return None
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(float(retry_after), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+def _is_transient_stream_error(error: Exception) -> bool:
+    """是否为读取流时的连接中断或读取超时（httpx 传输层错误，或 SDK 包装后的连接错误）"""
+    if not OPENAI_AVAILABLE:
+        return False
+    import httpx
+    from openai import APIConnectionError
+
+    return isinstance(error, (httpx.TransportError, APIConnectionError))
+
+
+def _backoff_delay(base: float, attempt: int) -> float:
+    """第 attempt 次重试的等待秒数：指数增长并带随机抖动，避免多个线程同时重发"""
+    delay = min(base * 2 ** (attempt - 1), STREAM_RETRY_MAX_DELAY)
+    return random.uniform(delay / 2, delay)
+
+
+def _make_rate_limiter(api_cfg: Dict[str, Any]) -> TokenBucket:
+    """按 system.api 配置创建单个客户端的令牌桶"""
+    return TokenBucket(
+        api_cfg.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+        api_cfg.get("burst", DEFAULT_BURST),
+    )
 
 
 class BaseModelClient:
@@ -43,10 +177,80 @@ class BaseModelClient:
         """聊天补全 - 子类需要实现"""
         raise NotImplementedError
 
+    def _cool_down_if_rate_limited(self, error: Exception) -> None:
+        """SDK 重试用尽后仍被限流时，暂停本客户端的令牌桶，避免其他线程继续撞限"""
+        cooldown = _rate_limit_cooldown(error, self.retry_delay)
+        if cooldown is not None:
+            self.logger.warning(f"服务商限流（429），{cooldown:.1f} 秒内暂停发送新请求")
+            self._rate_limiter.pause(cooldown)
+
     def test_connection(self) -> bool:
         """测试连接 - 子类需要实现"""
         raise NotImplementedError
 
+    def _stream_with_retry(
+        self, create: Callable[[Any], Any], on_delta: Callable[[str], None]
+    ) -> Tuple[str, Any]:
+        """
+        发起流式请求并读完全部数据块
+
+        create 接收 OpenAI SDK 客户端并发起请求。SDK 只重试拿到响应头之前的失败
+        （create() 抛出的异常直接上抛，不再重复重试）；流已建立、首个数据块到达前
+        连接中断或读取超时（长上下文首字延迟较长时常见）在这里按指数退避重试，
+        最多 max_retries 次。这些重发改用关闭 SDK 重试的客户端，两层重试不会相乘，
+        单次调用最多发出 2 * max_retries + 1 个请求。
+        已收到文本后不再重试，避免回调收到重复内容。
+        """
+        received = False
+
+        def forward(delta: str) -> None:
+            nonlocal received
+            received = True
+            on_delta(delta)
+
+        sdk_client = self.client
+        attempt = 0
+        while True:
+            # 建立连接阶段的失败已由 SDK 重试，这里只处理读流时的中断
+            stream = create(sdk_client)
+            try:
+                return self._consume_stream(stream, forward)
+            except Exception as e:
+                attempt += 1
+                if received or attempt > self.max_retries or not _is_transient_stream_error(e):
+                    raise
+                delay = _backoff_delay(self.retry_delay, attempt)
+                self.logger.warning(
+                    f"流式响应在首个数据块前中断，{delay:.1f} 秒后第 {attempt} 次重试: {e}"
+                )
+                time.sleep(delay)
+                self._apply_rate_limit()
+                if attempt == 1:
+                    sdk_client = self.client.with_options(max_retries=0)
+
+    @staticmethod
+    def _consume_stream(
+        stream: Any, on_delta: Callable[[str], None]
+    ) -> Tuple[str, Any]:
+        """
+        读取流式响应，每收到一段文本即回调 on_delta
+
+        Returns:
+            Tuple[str, Any]: (完整文本, usage；服务端未返回时为 None)
+        """
+        parts: List[str] = []
+        usage = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+        return "".join(parts), usage
+
 
 class DoubaoClient(BaseModelClient):
     """豆包客户端 - 使用 OpenAI 兼容方式"""
@@ -57,6 +261,7 @@ class DoubaoClient(BaseModelClient):
 
         if not OPENAI_AVAILABLE:
             raise Exception("openai 未安装，请先安装: pip install openai")
+        from openai import OpenAI
 
         self.api_key = config.get("doubao_api_key", os.environ.get("ARK_API_KEY", ""))
         self.base_url = config.get(
@@ -66,28 +271,27 @@ class DoubaoClient(BaseModelClient):
         self.temperature = config.get("temperature", 0.9)
         self.top_p = config.get("top_p", 0.9)
 
+        api_cfg = config.get("system", {}).get("api", {})
+        self.max_retries = api_cfg.get("max_retries", 5)
+        self.retry_delay = api_cfg.get("retry_delay", 2)
+
+        # 429/5xx/超时由 SDK 按指数退避（带抖动、遵循 Retry-After）自动重试
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
+            max_retries=self.max_retries,
+            http_client=_make_http_client(api_cfg),
         )
 
-        self.max_retries = config.get("system", {}).get("api", {}).get("max_retries", 5)
-        self.retry_delay = config.get("system", {}).get("api", {}).get("retry_delay", 2)
-
-        self.rate_limit_delay = 1.0
-        self.last_request_time = 0
+        self._rate_limiter = _make_rate_limiter(api_cfg)
 
     def _apply_rate_limit(self):
-        now = time.time()
-        time_since_last_request = now - self.last_request_time
-
-        if time_since_last_request < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_request
+        # 令牌桶预支后在锁外等待，并发调用时各线程按速率依次发出
+        sleep_time = self._rate_limiter.reserve()
+        if sleep_time > 0:
             self.logger.debug(f"豆包限流中，等待 {sleep_time:.2f} 秒")
             time.sleep(sleep_time)
 
-        self.last_request_time = time.time()
-
     def chat_completion(
         self, model: str, messages: List[Dict[str, str]], **kwargs
     ) -> str:
@@ -96,19 +300,31 @@ class DoubaoClient(BaseModelClient):
 
             self.logger.info(f"发送豆包API请求，模型: {model}")
 
-            completion = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
-                temperature=kwargs.get("temperature", self.temperature),
-                top_p=kwargs.get("top_p", self.top_p),
-                stream=False,
-            )
+            # 传入 on_delta 时使用流式响应，边生成边回调
+            on_delta = kwargs.get("on_delta")
+            request_kwargs = {
+                "model": model,
+                "messages": messages,
+                "max_tokens": kwargs.get("max_tokens", self.max_tokens),
+                "temperature": kwargs.get("temperature", self.temperature),
+                "top_p": kwargs.get("top_p", self.top_p),
+                "stream": on_delta is not None,
+            }
+
+            if on_delta is not None:
+                content, _ = self._stream_with_retry(
+                    lambda client: client.chat.completions.create(**request_kwargs), on_delta
+                )
+                self.logger.info("豆包API请求成功（流式）")
+                return content
+
+            completion = self.client.chat.completions.create(**request_kwargs)
 
             self.logger.info("豆包API请求成功")
             return completion.choices[0].message.content
 
         except Exception as e:
+            self._cool_down_if_rate_limited(e)
             raise Exception(f"豆包聊天补全失败: {e}")
 
     def test_connection(self) -> bool:
@@ -139,6 +355,7 @@ class DeepSeekClient(BaseModelClient):
 
         if not OPENAI_AVAILABLE:
             raise Exception("openai 未安装，请先安装: pip install openai")
+        from openai import OpenAI
 
         # API配置
         self.api_key = config.get(
@@ -149,29 +366,29 @@ class DeepSeekClient(BaseModelClient):
         self.temperature = config.get("temperature", 0.7)
         self.top_p = config.get("top_p", 0.7)
 
-        # 初始化OpenAI客户端
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
-
         # 请求配置
-        self.max_retries = config.get("system", {}).get("api", {}).get("max_retries", 5)
-        self.retry_delay = config.get("system", {}).get("api", {}).get("retry_delay", 2)
+        api_cfg = config.get("system", {}).get("api", {})
+        self.max_retries = api_cfg.get("max_retries", 5)
+        self.retry_delay = api_cfg.get("retry_delay", 2)
+
+        # 初始化OpenAI客户端（429/5xx/超时由 SDK 按指数退避自动重试）
+        self.client = OpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=self.max_retries,
+            http_client=_make_http_client(api_cfg),
+        )
 
         # 限流配置
-        self.rate_limit_delay = 1.0
-        self.last_request_time = 0
+        self._rate_limiter = _make_rate_limiter(api_cfg)
 
     def _apply_rate_limit(self):
-        """应用限流"""
-        now = time.time()
-        time_since_last_request = now - self.last_request_time
-
-        if time_since_last_request < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_request
+        """应用限流（线程安全）"""
+        sleep_time = self._rate_limiter.reserve()
+        if sleep_time > 0:
             self.logger.debug(f"DeepSeek限流中，等待 {sleep_time:.2f} 秒")
             time.sleep(sleep_time)
 
-        self.last_request_time = time.time()
-
     def chat_completion(
         self, model: str, messages: List[Dict[str, str]], **kwargs
     ) -> str:
@@ -193,16 +410,30 @@ class DeepSeekClient(BaseModelClient):
                 "stream": False,
             }
 
+            # 传入 on_delta 时使用流式响应，末尾数据块携带 usage 以保留缓存统计
+            on_delta = kwargs.get("on_delta")
+            if on_delta is not None:
+                request_kwargs["stream"] = True
+                request_kwargs["stream_options"] = {"include_usage": True}
+
             # 支持JSON输出模式
             response_format = kwargs.get("response_format")
             if response_format:
                 request_kwargs["response_format"] = response_format
                 self.logger.info("启用JSON输出模式")
 
+            if on_delta is not None:
+                content, usage = self._stream_with_retry(
+                    lambda client: client.chat.completions.create(**request_kwargs), on_delta
+                )
+                self._log_cache_stats(usage)
+                self.logger.info("DeepSeek API请求成功（流式）")
+                return content
+
             completion = self.client.chat.completions.create(**request_kwargs)
 
             # 记录缓存统计
-            self._log_cache_stats(completion)
+            self._log_cache_stats(getattr(completion, "usage", None))
 
             # 验证响应结构
             if completion is None:
@@ -216,12 +447,12 @@ class DeepSeekClient(BaseModelClient):
             return completion.choices[0].message.content
 
         except Exception as e:
+            self._cool_down_if_rate_limited(e)
             raise Exception(f"DeepSeek聊天补全失败: {e}")
 
-    def _log_cache_stats(self, completion):
+    def _log_cache_stats(self, usage):
         """记录DeepSeek缓存统计"""
         try:
-            usage = completion.usage
             if usage and hasattr(usage, 'prompt_cache_hit_tokens') and hasattr(usage, 'prompt_cache_miss_tokens'):
                 hit_tokens = usage.prompt_cache_hit_tokens
                 miss_tokens = usage.prompt_cache_miss_tokens
@@ -263,29 +494,31 @@ class DeepSeekClient(BaseModelClient):
 
 
 class MultiModelClient:
+    _CLIENT_CLASSES = {
+        "doubao": DoubaoClient,
+        "deepseek": DeepSeekClient,
+    }
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.settings = Settings(config)
         self.logger = logging.getLogger(__name__)
 
-        self.clients = {
-            "doubao": DoubaoClient(config),
-            "deepseek": DeepSeekClient(config) if OPENAI_AVAILABLE else None,
-        }
+        # 各服务商客户端按需构造：通常只用到一个服务商，避免为另一个创建连接池
+        self._clients: Dict[str, Optional[BaseModelClient]] = {}
+        self._clients_lock = threading.Lock()
+
+        # 所有调用方共享同一并发额度，多层并发叠加时也不会超出
+        concurrency = config.get("system", {}).get("api", {}).get("concurrency", DEFAULT_CONCURRENCY)
+        self._call_slots = threading.BoundedSemaphore(max(1, concurrency))
+
+        # 响应缓存目录（system.api.response_cache_dir），为空时不缓存
+        cache_dir = config.get("system", {}).get("api", {}).get("response_cache_dir")
+        self.response_cache_dir = Path(cache_dir) if cache_dir else None
 
         self.model_mapping = {
-            "doubao": {
-                "logic_analysis_model": "doubao-seed-2-0-lite-260215",
-                "major_chapters_model": "doubao-seed-2-0-lite-260215",
-                "sub_chapters_model": "doubao-seed-2-0-lite-260215",
-                "expansion_model": "doubao-seed-2-0-lite-260215",
-            },
-            "deepseek": {
-                "logic_analysis_model": "deepseek-chat",
-                "major_chapters_model": "deepseek-chat",
-                "sub_chapters_model": "deepseek-chat",
-                "expansion_model": "deepseek-chat",
-            },
+            model_type: dict(models)
+            for model_type, models in DEFAULT_MODEL_MAPPING.items()
         }
 
         if "doubao_models" in config:
@@ -294,6 +527,28 @@ class MultiModelClient:
         if "deepseek_models" in config:
             self.model_mapping["deepseek"].update(config["deepseek_models"])
 
+    @property
+    def clients(self) -> Dict[str, Optional[BaseModelClient]]:
+        """全部服务商客户端（遍历时才构造尚未创建的客户端）"""
+        for model_type in self._CLIENT_CLASSES:
+            self._get_or_create_client(model_type)
+        return self._clients
+
+    def _client_available(self, model_type: str) -> bool:
+        """不构造客户端判断服务商是否可用（各服务商客户端都依赖 openai SDK）"""
+        return model_type in self._CLIENT_CLASSES and OPENAI_AVAILABLE
+
+    def _get_or_create_client(self, model_type: str) -> Optional[BaseModelClient]:
+        if model_type not in self._clients:
+            # 并发调用时只创建一个实例，保证限流状态共享
+            with self._clients_lock:
+                if model_type not in self._clients:
+                    if model_type == "deepseek" and not OPENAI_AVAILABLE:
+                        self._clients[model_type] = None
+                    else:
+                        self._clients[model_type] = self._CLIENT_CLASSES[model_type](self.config)
+        return self._clients[model_type]
+
     def get_client(self, model_type: str) -> BaseModelClient:
         """
         获取指定类型的客户端
@@ -311,10 +566,10 @@ class MultiModelClient:
         if not model_type:
             raise ValueError("model_type 不能为空，请通过 role_config.provider 或显式参数指定")
 
-        if model_type not in self.clients:
+        if model_type not in self._CLIENT_CLASSES:
             raise Exception(f"不支持的模型类型: {model_type}")
 
-        client = self.clients[model_type]
+        client = self._get_or_create_client(model_type)
         if client is None:
             raise Exception(f"模型客户端 {model_type} 未正确初始化")
 
@@ -352,7 +607,7 @@ class MultiModelClient:
             stage = kwargs.get("stage", "default")
             model = self.get_model_for_stage(model_type, stage)
 
-        return client.chat_completion(model, messages, **kwargs)
+        return self._complete(model_type, client, model, messages, kwargs)
 
     def chat_completion_with_role(
         self, role_config: Dict[str, Any], messages: List[Dict[str, str]], **kwargs
@@ -389,7 +644,44 @@ class MultiModelClient:
             **kwargs,
         }
 
-        return client.chat_completion(model, messages, **merged_kwargs)
+        return self._complete(provider, client, model, messages, merged_kwargs)
+
+    def _complete(
+        self,
+        provider: str,
+        client: BaseModelClient,
+        model: str,
+        messages: List[Dict[str, str]],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        """发送请求；开启响应缓存时，完全相同的请求直接返回上次的结果"""
+        cache_path = None
+        if self.response_cache_dir is not None:
+            key = _response_cache_key(provider, model, messages, kwargs)
+            cache_path = self.response_cache_dir / f"{key}.json"
+            try:
+                cached = json_loads(cache_path.read_bytes())
+            except (FileNotFoundError, ValueError):
+                cached = None
+            if isinstance(cached, dict) and isinstance(cached.get("content"), str):
+                self.logger.info(f"命中响应缓存，跳过API请求: {cache_path.name}")
+                # 流式调用方（进度显示、逐章落盘）同样要收到缓存的正文
+                on_delta = kwargs.get("on_delta")
+                if on_delta is not None:
+                    on_delta(cached["content"])
+                return cached["content"]
+
+        with self._call_slots:
+            response = client.chat_completion(model, messages, **kwargs)
+
+        if cache_path is not None and response:
+            try:
+                atomic_write_text(
+                    cache_path, json_dumps({"provider": provider, "model": model, "content": response})
+                )
+            except OSError as e:
+                self.logger.warning(f"写入响应缓存失败: {e}")
+        return response
 
     def get_model_for_stage(self, model_type: str, stage: str) -> str:
         """
@@ -402,19 +694,11 @@ class MultiModelClient:
         Returns:
             str: 模型名称
         """
-        stage_mapping = {
-            "stage1": "logic_analysis_model",
-            "stage2": "major_chapters_model",
-            "stage3": "sub_chapters_model",
-            "stage4": "expansion_model",
-            "stage5": "expansion_model",
-            "default": "expansion_model",
-        }
-
-        model_key = stage_mapping.get(stage, "expansion_model")
-        return self.model_mapping[model_type].get(
-            model_key, self.model_mapping[model_type].get("expansion_model", "")
-        )
+        models = self.model_mapping[model_type]
+        model_key = STAGE_MODEL_KEYS.get(stage, "expansion_model")
+        if model_key in models:
+            return models[model_key]
+        return models.get("expansion_model", "")
 
     def switch_model(self, model_type: str) -> bool:
         """
@@ -426,11 +710,12 @@ class MultiModelClient:
         Returns:
             bool: 模型是否可用
         """
-        if model_type not in self.clients:
+        if model_type not in self._CLIENT_CLASSES:
             self.logger.error(f"不支持的模型类型: {model_type}")
             return False
 
-        if self.clients[model_type] is None:
+        # 只构造要切换到的服务商客户端
+        if not self._client_available(model_type) or self._get_or_create_client(model_type) is None:
             self.logger.error(f"模型客户端 {model_type} 未正确初始化")
             return False
 
@@ -464,12 +749,16 @@ class MultiModelClient:
         Returns:
             Dict[str, bool]: 各模型连接状态
         """
-        results = {}
-        for model_type, client in self.clients.items():
-            if client is not None:
-                results[model_type] = self.test_connection(model_type)
-            else:
-                results[model_type] = False
+        clients = self.clients
+        available = [model_type for model_type, client in clients.items() if client is not None]
+        results = {model_type: False for model_type in clients}
+        if not available:
+            return results
+
+        # 各服务商互不依赖，并发测试
+        with ThreadPoolExecutor(max_workers=len(available)) as executor:
+            for model_type, ok in zip(available, executor.map(self.test_connection, available)):
+                results[model_type] = ok
 
         return results
 
@@ -480,12 +769,9 @@ class MultiModelClient:
         Returns:
             List[str]: 可用模型列表
         """
-        available = []
-        for model_type, client in self.clients.items():
-            if client is not None:
-                available.append(model_type)
-
-        return available
+        return [
+            model_type for model_type in self._CLIENT_CLASSES if self._client_available(model_type)
+        ]
 
     def get_current_model(self) -> str:
         """
@@ -495,3 +781,67 @@ class MultiModelClient:
         raise NotImplementedError(
             "get_current_model 已废弃，请通过 role_config.provider 获取当前模型"
         )
+
+
+# 影响客户端构造的配置项（API Key、地址、模型、采样参数、重试配置）
+_CLIENT_CONFIG_KEYS = (
+    "doubao_api_key",
+    "doubao_api_base_url",
+    "doubao_models",
+    "deepseek_api_key",
+    "deepseek_api_base_url",
+    "deepseek_models",
+    "max_tokens",
+    "temperature",
+    "top_p",
+)
+
+_client_cache: Dict[str, MultiModelClient] = {}
+
+# 不影响服务端响应内容的参数：流式回调、仅用于选模型的阶段名（模型已单独计入缓存键）
+_RESPONSE_CACHE_IGNORED_KWARGS = ("on_delta", "stage")
+
+
+def _client_fingerprint(config: Dict[str, Any]) -> str:
+    """计算客户端相关配置的指纹"""
+    subset = {key: config.get(key) for key in _CLIENT_CONFIG_KEYS}
+    subset["system_api"] = config.get("system", {}).get("api", {})
+    payload = json.dumps(subset, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _response_cache_key(
+    provider: str, model: str, messages: List[Dict[str, str]], kwargs: Dict[str, Any]
+) -> str:
+    """按服务商、模型、消息和采样参数计算响应缓存键（回调等非请求参数不参与）"""
+    request = {
+        key: value for key, value in kwargs.items()
+        if key not in _RESPONSE_CACHE_IGNORED_KWARGS and not callable(value)
+    }
+    payload = json.dumps(
+        [provider, model, messages, request], sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_multi_model_client(config: Dict[str, Any]) -> MultiModelClient:
+    """
+    获取多模型客户端（按配置指纹复用，避免重复创建SDK客户端）
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        MultiModelClient: 多模型客户端
+    """
+    fingerprint = _client_fingerprint(config)
+    client = _client_cache.get(fingerprint)
+    if client is None:
+        client = MultiModelClient(config)
+        _client_cache[fingerprint] = client
+    return client
+
+
+def clear_client_cache() -> None:
+    """清空客户端缓存（API配置变更后调用）"""
+    _client_cache.clear()
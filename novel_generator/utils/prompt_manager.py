@@ -1,4 +1,3 @@
-import yaml
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import logging
@@ -41,17 +40,16 @@ class PromptManager:
         self._outline_generation_prompts = None
 
     def _load_yaml(self, filename: str) -> Dict[str, Any]:
+        # 经 load_yaml_file 读取：进程内按文件签名复用解析结果，
+        # 多个 PromptManager 实例（大纲、扩写各建一个）不会重复解析同一份 YAML
+        from novel_generator.utils.common import load_yaml_file
+
         filepath = self.prompt_dir / filename
         if not filepath.exists():
             self.logger.warning(f"Prompt文件不存在: {filepath}")
             return {}
 
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f) or {}
-        except Exception as e:
-            self.logger.error(f"加载Prompt文件失败 {filename}: {e}")
-            return {}
+        return load_yaml_file(filepath, default={})
 
     @property
     def system_prompts(self) -> Dict[str, Any]:
@@ -0,0 +1,56 @@
+"""
+Tests for CLI helpers in novel_generator.cli.utils
+"""
+
+from novel_generator.cli.utils import BATCH_SPOOL_NAME, StreamProgress, print_failed_chapters
+
+
+class TestStreamProgressSpool:
+    """Test suite for the batch stream spool file"""
+
+    def test_rerun_after_failure_starts_fresh_spool(self, tmp_path, capsys):
+        """Test that a rerun does not append to a failed run's partial output"""
+        spool = tmp_path / BATCH_SPOOL_NAME
+
+        failed = StreamProgress("批量生成", spool_path=spool)
+        failed("第一次运行的半章正文。")
+        failed.finish()
+        assert spool.read_text(encoding="utf-8") == "第一次运行的半章正文。"
+
+        rerun = StreamProgress("批量生成", spool_path=spool)
+        assert not spool.exists()
+        rerun("第二次运行的正文。")
+        rerun.finish()
+
+        assert spool.read_text(encoding="utf-8") == "第二次运行的正文。"
+
+    def test_discard_removes_spool_on_success(self, tmp_path, capsys):
+        """Test that the spool is deleted once the results are saved"""
+        spool = tmp_path / BATCH_SPOOL_NAME
+        progress = StreamProgress("批量生成", spool_path=spool)
+        progress("正文。")
+        progress.finish()
+
+        progress.discard_spool()
+
+        assert not spool.exists()
+
+
+class TestPrintFailedChapters:
+    """Test suite for the retry hint after a generation loop"""
+
+    def test_one_command_per_contiguous_run(self, capsys):
+        """Test that chapters that succeeded between failures are not suggested"""
+        print_failed_chapters([3, 4, 7, 9, 10])
+
+        out = capsys.readouterr().out
+        assert "soundnovel regenerate --chapters 3-4" in out
+        assert "soundnovel regenerate --chapter 7" in out
+        assert "soundnovel regenerate --chapters 9-10" in out
+        assert "3-10" not in out
+
+    def test_single_run(self, capsys):
+        """Test that a contiguous failure keeps the one-line hint"""
+        print_failed_chapters([5, 6])
+
+        assert "可运行 'soundnovel regenerate --chapters 5-6' 重试" in capsys.readouterr().out
@@ -1,4 +1,7 @@
 import json
+from unittest import mock
+
+import pytest
 
 from novel_generator.config.config_manager import ConfigManager
 
@@ -108,3 +111,35 @@ class TestConfigManager:
         config = manager.get_api_config()
         assert "novel_generation" in config
         assert "ai_roles" in config
+
+
+class TestSetChapterStates:
+    def _make_manager(self):
+        manager = ConfigManager.__new__(ConfigManager)
+        manager._novel = mock.Mock()
+        manager._novel.load_state.return_value = {"chapter_states": {"1": "clean"}}
+        manager._novel.save_state.return_value = True
+        return manager
+
+    def test_sets_all_states_with_one_save(self):
+        manager = self._make_manager()
+
+        assert manager.set_chapter_states([2, 3], "dirty") is True
+
+        manager._novel.save_state.assert_called_once_with(
+            {"chapter_states": {"1": "clean", "2": "dirty", "3": "dirty"}}
+        )
+
+    def test_saves_applied_states_when_interrupted(self):
+        manager = self._make_manager()
+
+        def chapters():
+            yield 2
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(RuntimeError):
+            manager.set_chapter_states(chapters(), "dirty")
+
+        manager._novel.save_state.assert_called_once_with(
+            {"chapter_states": {"1": "clean", "2": "dirty"}}
+        )
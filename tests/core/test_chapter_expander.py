@@ -0,0 +1,55 @@
+"""
+Tests for batch context handling in novel_generator.core.chapter_expander
+"""
+
+from unittest import mock
+
+from novel_generator.core.chapter_expander import ChapterExpander
+
+
+class TestExpandRangeContext:
+    """Test suite for the prior-chapter context sent with batch requests"""
+
+    def _make_expander(self):
+        expander = ChapterExpander({}, multi_model_client=mock.Mock())
+        expander.ai_role_manager = mock.Mock()
+        expander.ai_role_manager.chat_completion.return_value = (
+            "第二章正文\n===第2章结束===\n第三章正文\n===第3章结束==="
+        )
+        return expander
+
+    def _outline(self):
+        return {f"第{ch}章": {"标题": f"标题{ch}", "核心事件": f"事件{ch}"} for ch in range(1, 4)}
+
+    def test_batch_prompt_includes_prior_chapter_from_draft_dir(self, tmp_path):
+        """Test that the novel's draft dir, not the configured default, feeds the batch prompt"""
+        draft_dir = tmp_path / "novels" / "demo" / "draft"
+        draft_dir.mkdir(parents=True)
+        (draft_dir / "第0001章.txt").write_text("上一章的结尾：雨停了。", encoding="utf-8")
+        expander = self._make_expander()
+
+        results = expander.expand_range(
+            2, 3, self._outline(), batch_size=5,
+            draft_dir=str(draft_dir), outline_window=5, draft_window=1,
+        )
+
+        assert sorted(results) == [2, 3]
+        messages = expander.ai_role_manager.chat_completion.call_args.kwargs["messages"]
+        prompt = "\n".join(m["content"] for m in messages)
+        assert "上一章的结尾：雨停了。" in prompt
+        assert "事件1" in prompt
+
+    def test_zero_windows_send_no_prior_context(self, tmp_path):
+        """Test that the caller's window settings are honored"""
+        (tmp_path / "第0001章.txt").write_text("上一章的结尾：雨停了。", encoding="utf-8")
+        expander = self._make_expander()
+
+        expander.expand_range(
+            2, 3, self._outline(), batch_size=5,
+            draft_dir=str(tmp_path), outline_window=0, draft_window=0,
+        )
+
+        messages = expander.ai_role_manager.chat_completion.call_args.kwargs["messages"]
+        prompt = "\n".join(m["content"] for m in messages)
+        assert "雨停了" not in prompt
+        assert "事件1" not in prompt
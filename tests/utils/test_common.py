@@ -0,0 +1,193 @@
+"""
+Tests for helpers in novel_generator.utils.common
+"""
+
+import os
+
+from novel_generator.utils import common
+from novel_generator.utils.common import (
+    build_chapter_key_index,
+    find_outline_files,
+    get_chapter_data,
+    load_outline_file,
+    load_yaml_file,
+    normalize_core_setting,
+    parse_chapter_range,
+    save_yaml_file,
+)
+
+
+class TestNormalizeCoreSetting:
+    """Test suite for normalize_core_setting"""
+
+    def test_template_placeholders(self):
+        """Test that comment-only template sections become empty containers"""
+        data = {"人物小传": {"主角": None, "配角1": None}, "伏笔清单": None}
+        result = normalize_core_setting(data)
+
+        assert result["人物小传"] == {"主角": {}, "配角1": {}}
+        assert result["伏笔清单"] == []
+        assert result["设定禁忌"] == []
+
+    def test_keeps_valid_structure(self):
+        """Test that already well-formed data is left intact"""
+        data = {
+            "人物小传": {"林凡": {"身份": "外门弟子"}, "苏瑶": "师姐"},
+            "伏笔清单": ["玉佩来历"],
+            "设定禁忌": {"力量体系": ["不得越级秒杀"]},
+        }
+        result = normalize_core_setting(data)
+
+        assert result["人物小传"]["林凡"] == {"身份": "外门弟子"}
+        assert result["人物小传"]["苏瑶"] == "师姐"
+        assert result["伏笔清单"] == ["玉佩来历"]
+        assert result["设定禁忌"] == {"力量体系": ["不得越级秒杀"]}
+
+    def test_non_dict_input(self):
+        """Test that a non-mapping YAML document still yields the required keys"""
+        empty = {"人物小传": {}, "伏笔清单": [], "设定禁忌": []}
+        assert normalize_core_setting(None) == empty
+        assert normalize_core_setting(["a"]) == empty
+
+    def test_keeps_values_it_cannot_structure(self):
+        """Test that odd shapes are converted to text instead of dropped"""
+        data = {
+            "人物小传": [{"林凡": "外门弟子"}, "苏瑶", {"老者": ["神秘", "护道"]}],
+            "伏笔清单": 42,
+        }
+        result = normalize_core_setting(data)
+
+        assert result["人物小传"] == {"林凡": "外门弟子", "苏瑶": {}, "老者": "神秘；护道"}
+        assert result["伏笔清单"] == ["42"]
+
+
+class TestLoadYamlFile:
+    """Test suite for the mtime-guarded YAML cache"""
+
+    def test_returns_independent_copies(self, tmp_path):
+        """Test that mutating a result does not leak into the cache"""
+        path = tmp_path / "core_setting.yaml"
+        path.write_text("人物小传:\n  主角: 林凡\n", encoding="utf-8")
+
+        first = load_yaml_file(path)
+        first["人物小传"]["主角"] = "改名"
+
+        assert load_yaml_file(path)["人物小传"]["主角"] == "林凡"
+
+    def test_reloads_after_change(self, tmp_path):
+        """Test that a modified file is parsed again"""
+        path = tmp_path / "chapter_plan.yaml"
+        path.write_text("总章节数: 10\n", encoding="utf-8")
+        assert load_yaml_file(path)["总章节数"] == 10
+
+        path.write_text("总章节数: 200\n", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_yaml_file(path)["总章节数"] == 200
+
+    def test_load_has_no_write_side_effects(self, tmp_path):
+        """Test that loading leaves no cache files next to the source"""
+        path = tmp_path / "core_setting.yaml"
+        path.write_text("伏笔清单:\n  - 玉佩\n", encoding="utf-8")
+
+        assert load_yaml_file(path) == {"伏笔清单": ["玉佩"]}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["core_setting.yaml"]
+
+
+class TestSaveYamlFile:
+    """Test suite for save_yaml_file"""
+
+    def test_write_through_cache(self, tmp_path, monkeypatch):
+        """Test that a saved file is served from the cache without re-parsing"""
+        path = tmp_path / "core_setting.yaml"
+        data = {"世界观": "修仙", "伏笔清单": ["玉佩"]}
+        save_yaml_file(path, data)
+        data["伏笔清单"].append("changed")
+
+        def fail_load(stream):
+            raise AssertionError("file was parsed again")
+
+        monkeypatch.setattr(common, "yaml_load", fail_load)
+        assert load_yaml_file(path) == {"世界观": "修仙", "伏笔清单": ["玉佩"]}
+
+
+class TestLoadOutlineFile:
+    """Test suite for load_outline_file"""
+
+    def test_json_outline(self, tmp_path):
+        """Test that outline.json is parsed as JSON"""
+        path = tmp_path / "outline.json"
+        path.write_text('{"第1章": {"标题": "开端"}}', encoding="utf-8")
+
+        assert load_outline_file(path) == {"第1章": {"标题": "开端"}}
+
+    def test_yaml_outline(self, tmp_path):
+        """Test that legacy YAML outlines still load"""
+        path = tmp_path / "chapter_outline_01-10.yaml"
+        path.write_text("第1章:\n  标题: 开端\n", encoding="utf-8")
+
+        assert load_outline_file(path) == {"第1章": {"标题": "开端"}}
+
+    def test_missing_with_default(self, tmp_path):
+        """Test the default for a missing file"""
+        assert load_outline_file(tmp_path / "outline.json", default={}) == {}
+
+    def test_json_outline_with_bom(self, tmp_path):
+        """Test that a BOM-prefixed outline.json still parses"""
+        path = tmp_path / "outline.json"
+        path.write_bytes('\ufeff{"第1章": {"标题": "开端"}}'.encode("utf-8"))
+
+        assert load_outline_file(path) == {"第1章": {"标题": "开端"}}
+
+
+class TestParseChapterRange:
+    """Test suite for parse_chapter_range"""
+
+    def test_mixed_keys(self):
+        """Test that chapter numbers are read from both formatted and bare keys"""
+        assert parse_chapter_range({"第3章": {}, "第12章": {}, 7: {}}) == (3, 12)
+
+    def test_empty_outline(self):
+        """Test the fallback range for an outline without chapters"""
+        assert parse_chapter_range({"说明": {}}) == (1, 1)
+
+
+class TestFindOutlineFiles:
+    """Test suite for find_outline_files"""
+
+    def test_lists_and_refreshes(self, tmp_path, monkeypatch):
+        """Test outline file filtering and that new files show up on the next call"""
+        outline_dir = tmp_path / "outline"
+        outline_dir.mkdir()
+        monkeypatch.setattr(
+            common, "get_current_novel_paths", lambda root: {"outline_dir": outline_dir}
+        )
+        (outline_dir / "outline.json").write_text("{}", encoding="utf-8")
+        (outline_dir / "notes.yaml").write_text("", encoding="utf-8")
+
+        assert find_outline_files(tmp_path) == [outline_dir / "outline.json"]
+
+        new_file = outline_dir / "chapter_outline_01-10.yaml"
+        new_file.write_text("", encoding="utf-8")
+
+        assert find_outline_files(tmp_path) == [new_file, outline_dir / "outline.json"]
+
+
+class TestChapterKeyIndex:
+    """Test suite for build_chapter_key_index"""
+
+    def test_matches_direct_lookup(self):
+        """Test that indexed lookups agree with probing each key format"""
+        outline = {
+            "第1章": {"标题": "a"},
+            "1": {"标题": "dup"},
+            "2": {"标题": "b"},
+            "Chapter 3": {"标题": "c"},
+            "第10章 补充": {"标题": "ignored"},
+        }
+        index = build_chapter_key_index(outline)
+
+        for ch in range(0, 12):
+            assert get_chapter_data(outline, ch, index) == get_chapter_data(outline, ch)
+        assert index == {1: "第1章", 2: "2", 3: "Chapter 3"}
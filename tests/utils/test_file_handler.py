@@ -0,0 +1,200 @@
+"""
+Tests for atomic writes in novel_generator.utils.file_handler
+"""
+
+import json
+from unittest import mock
+
+import pytest
+import yaml
+
+from novel_generator.utils.file_handler import (
+    FileHandler, atomic_write_text, json_dumps, json_loads, read_text_auto, yaml_dump, yaml_load,
+)
+
+
+class TestAtomicWrite:
+    """Test suite for atomic_write_text"""
+
+    def test_write_creates_parent_dirs(self, tmp_path):
+        """Test writing into a missing directory"""
+        target = tmp_path / "a" / "b" / "第0001章.txt"
+        atomic_write_text(target, "正文内容")
+
+        assert target.read_text(encoding="utf-8") == "正文内容"
+        assert list(target.parent.iterdir()) == [target]
+
+    def test_failed_write_keeps_original(self, tmp_path):
+        """Test that an interrupted write leaves the old file intact"""
+        target = tmp_path / "outline.json"
+        target.write_text('{"old": true}', encoding="utf-8")
+
+        with mock.patch("novel_generator.utils.file_handler.os.replace", side_effect=OSError("boom")):
+            with pytest.raises(OSError):
+                atomic_write_text(target, '{"new": true}')
+
+        assert json.loads(target.read_text(encoding="utf-8")) == {"old": True}
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_file_handler_write_json(self, tmp_path):
+        """Test FileHandler.write_json goes through the atomic path"""
+        handler = FileHandler(str(tmp_path))
+        handler.write_json("config/state.json", {"章节": 1}, backup=False)
+
+        saved = json.loads((tmp_path / "config" / "state.json").read_text(encoding="utf-8"))
+        assert saved == {"章节": 1}
+
+    def test_recreates_dir_removed_after_first_write(self, tmp_path):
+        """Test that a cached directory deleted mid-run is created again"""
+        target = tmp_path / "draft" / "第0001章.txt"
+        atomic_write_text(target, "第一版")
+
+        target.unlink()
+        target.parent.rmdir()
+        atomic_write_text(target, "第二版")
+
+        assert target.read_text(encoding="utf-8") == "第二版"
+
+    def test_new_file_respects_umask(self, tmp_path):
+        """Test that a new file gets 0o666 minus the process umask"""
+        target = tmp_path / "state.json"
+        with mock.patch("novel_generator.utils.file_handler._NEW_FILE_MODE", 0o640):
+            atomic_write_text(target, "{}")
+
+        assert target.stat().st_mode & 0o777 == 0o640
+
+    def test_replace_keeps_existing_mode(self, tmp_path):
+        """Test that replacing a file keeps its permissions"""
+        target = tmp_path / "state.json"
+        target.write_text("{}", encoding="utf-8")
+        target.chmod(0o600)
+
+        atomic_write_text(target, "{\"a\": 1}")
+
+        assert target.stat().st_mode & 0o777 == 0o600
+
+
+class TestReadTextAuto:
+    """Test suite for read_text_auto"""
+
+    def test_utf8_with_bom(self, tmp_path):
+        """Test that UTF-8 files (with BOM) decode without detection"""
+        target = tmp_path / "core_setting.yaml"
+        target.write_bytes("\ufeff世界观: 修仙".encode("utf-8"))
+
+        with mock.patch("novel_generator.utils.file_handler.detect_encoding") as detect:
+            assert read_text_auto(target) == "世界观: 修仙"
+        detect.assert_not_called()
+
+    def test_utf16_with_bom(self, tmp_path):
+        """Test that UTF-16 files saved by Notepad skip the detector"""
+        target = tmp_path / "core_setting.yaml"
+        target.write_bytes("世界观: 修仙".encode("utf-16"))
+
+        with mock.patch("novel_generator.utils.file_handler._get_encoding_detector") as detector:
+            assert read_text_auto(target) == "世界观: 修仙"
+        detector.assert_not_called()
+
+    def test_gbk_file(self, tmp_path):
+        """Test that a GBK-encoded source file is read correctly"""
+        text = "世界观: 修仙大陆，灵气复苏，宗门林立。\n主角: 林凡，出身寒微的少年。\n" * 5
+        target = tmp_path / "chapter_plan.yaml"
+        target.write_bytes(text.encode("gbk"))
+
+        assert read_text_auto(target) == text
+
+    def test_gb2312_report_decodes_as_gb18030(self, tmp_path):
+        """Test that a GB2312 guess still reads characters outside GB2312"""
+        text = "主角: 林凡\n配角: 王镕、李䶮\n"
+        target = tmp_path / "core_setting.yaml"
+        target.write_bytes(text.encode("gb18030"))
+
+        with mock.patch(
+            "novel_generator.utils.file_handler._get_encoding_detector",
+            return_value=lambda raw: "GB2312",
+        ):
+            assert read_text_auto(target) == text
+
+    def test_undecodable_file_raises(self, tmp_path):
+        """Test that bytes no candidate encoding accepts raise instead of turning into mojibake"""
+        target = tmp_path / "core_setting.yaml"
+        target.write_bytes(b"\xff\xff\x80 broken")
+
+        with mock.patch(
+            "novel_generator.utils.file_handler._get_encoding_detector",
+            return_value=lambda raw: "utf-8",
+        ):
+            with pytest.raises(UnicodeDecodeError):
+                read_text_auto(target)
+
+
+class TestJsonHelpers:
+    """Test suite for json_loads/json_dumps"""
+
+    def test_round_trip_keeps_chinese(self):
+        """Test that dumps writes readable Chinese and loads restores it"""
+        data = {"第1章": {"标题": "开端", "字数目标": 3000}}
+        text = json_dumps(data)
+
+        assert "开端" in text
+        assert json_loads(text) == data
+        assert json_loads(text.encode("utf-8")) == data
+
+    def test_exponent_floats_round_trip(self):
+        """Test that floats keep their value whichever backend formats them"""
+        data = {"big": 1e16, "small": 1e-05}
+
+        assert json_loads(json_dumps(data)) == data
+
+    def test_non_finite_floats_with_stdlib(self):
+        """Test that the stdlib fallback keeps NaN/Infinity literals"""
+        with mock.patch("novel_generator.utils.file_handler.orjson", None):
+            text = json_dumps({"a": float("nan"), "b": float("inf")}, indent=False)
+
+        assert text == '{"a": NaN, "b": Infinity}'
+
+    def test_non_finite_floats_with_orjson(self):
+        """Test the documented orjson difference: NaN/Infinity become null"""
+        pytest.importorskip("orjson")
+
+        text = json_dumps({"a": float("nan"), "b": float("inf")}, indent=False)
+
+        assert json_loads(text) == {"a": None, "b": None}
+
+    def test_invalid_json_raises_decode_error(self):
+        """Test that malformed input raises json.JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            json_loads("{'第1章': ")
+
+
+class TestYamlHelpers:
+    """Test suite for yaml_dump/yaml_load"""
+
+    def test_matches_yaml_dump_and_round_trips(self):
+        """Test that plain data serializes like yaml.dump and loads back unchanged"""
+        data = {
+            "第1章": {"标题": "开端", "字数目标": 3000, "比例": 0.5, "完结": False, "备注": None},
+            "伏笔清单": ["玉佩来历", "yes", "1e16"],
+            "正文": "第一行\n第二行",
+        }
+        kwargs = {"allow_unicode": True, "default_flow_style": False}
+
+        text = yaml_dump(data, **kwargs)
+
+        assert text == yaml.dump(data, **kwargs)
+        assert yaml_load(text) == data
+
+    def test_tuple_written_as_list(self):
+        """Test that tuples no longer need the unsafe python/tuple tag"""
+        text = yaml_dump({"范围": (1, 10)})
+
+        assert yaml_load(text) == {"范围": [1, 10]}
+
+    def test_unsupported_object_falls_back_to_default_dumper(self):
+        """Test that objects the safe dumper rejects are still written"""
+        class Marker:
+            pass
+
+        text = yaml_dump({"对象": Marker()})
+
+        assert "Marker" in text
@@ -0,0 +1,220 @@
+"""
+Tests for the rate limiter in novel_generator.utils.multi_model_client
+"""
+
+from unittest import mock
+
+import pytest
+
+from novel_generator.utils.multi_model_client import BaseModelClient, MultiModelClient, TokenBucket
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    def test_burst_then_paced(self):
+        """Test that a full bucket allows a burst, then paces at the rate"""
+        with mock.patch("novel_generator.utils.multi_model_client.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate=2.0, capacity=3)
+            waits = [bucket.reserve() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3:] == pytest.approx([0.5, 1.0])
+
+    def test_refills_over_time(self):
+        """Test that tokens refill up to capacity while idle"""
+        clock = mock.Mock(return_value=0.0)
+        with mock.patch("novel_generator.utils.multi_model_client.time.monotonic", clock):
+            bucket = TokenBucket(rate=1.0, capacity=2)
+            assert bucket.reserve() == 0.0
+            assert bucket.reserve() == 0.0
+            clock.return_value = 10.0
+            waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits == pytest.approx([0.0, 0.0, 1.0])
+
+    def test_pause_delays_next_token(self):
+        """Test that pause() holds back every caller for the cool-down"""
+        with mock.patch("novel_generator.utils.multi_model_client.time.monotonic", return_value=0.0):
+            bucket = TokenBucket(rate=1.0, capacity=5)
+            bucket.pause(3.0)
+            waits = [bucket.reserve() for _ in range(2)]
+
+        assert waits == pytest.approx([3.0, 4.0])
+
+    def test_rejects_non_positive_rate(self):
+        """Test that a zero rate is rejected"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestResponseCache:
+    """Test suite for the on-disk response cache"""
+
+    def _make_client(self, tmp_path, cache=True):
+        api = {"response_cache_dir": str(tmp_path / "responses")} if cache else {}
+        client = MultiModelClient({"system": {"api": api}})
+        backend = mock.Mock()
+        backend.chat_completion.return_value = "第一章正文"
+        client._clients["deepseek"] = backend
+        return client, backend
+
+    def test_identical_request_hits_cache(self, tmp_path):
+        """Test that a repeated request is served from disk"""
+        client, backend = self._make_client(tmp_path)
+        messages = [{"role": "user", "content": "扩写第1章"}]
+
+        first = client.chat_completion("deepseek", "deepseek-chat", messages, temperature=0.7)
+        second = client.chat_completion("deepseek", "deepseek-chat", messages, temperature=0.7)
+
+        assert first == second == "第一章正文"
+        assert backend.chat_completion.call_count == 1
+
+    def test_changed_params_miss_cache(self, tmp_path):
+        """Test that different sampling parameters are cached separately"""
+        client, backend = self._make_client(tmp_path)
+        messages = [{"role": "user", "content": "扩写第1章"}]
+
+        client.chat_completion("deepseek", "deepseek-chat", messages, temperature=0.7)
+        client.chat_completion("deepseek", "deepseek-chat", messages, temperature=0.9)
+
+        assert backend.chat_completion.call_count == 2
+
+    def test_streaming_request_hits_cache_and_replays_text(self, tmp_path):
+        """Test that callbacks do not change the key and a hit still reaches on_delta"""
+        client, backend = self._make_client(tmp_path)
+        messages = [{"role": "user", "content": "扩写第1章"}]
+        first_deltas, second_deltas = [], []
+
+        client.chat_completion("deepseek", "deepseek-chat", messages, on_delta=first_deltas.append)
+        second = client.chat_completion(
+            "deepseek", "deepseek-chat", messages, on_delta=second_deltas.append
+        )
+
+        assert backend.chat_completion.call_count == 1
+        assert second == "第一章正文"
+        assert "".join(second_deltas) == "第一章正文"
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test that nothing is cached without response_cache_dir"""
+        client, backend = self._make_client(tmp_path, cache=False)
+        messages = [{"role": "user", "content": "扩写第1章"}]
+
+        client.chat_completion("deepseek", "deepseek-chat", messages)
+        client.chat_completion("deepseek", "deepseek-chat", messages)
+
+        assert backend.chat_completion.call_count == 2
+        assert not (tmp_path / "responses").exists()
+
+
+class TestLazyClients:
+    """Test suite for on-demand provider client construction"""
+
+    def test_availability_checks_build_no_clients(self):
+        """Test that listing providers does not construct any client"""
+        client = MultiModelClient({})
+        with mock.patch("novel_generator.utils.multi_model_client.OPENAI_AVAILABLE", True):
+            assert client.get_available_models() == ["doubao", "deepseek"]
+        assert client._clients == {}
+
+    def test_switch_model_builds_only_target(self):
+        """Test that switching builds just the requested provider"""
+        client = MultiModelClient({})
+        backend = mock.Mock()
+        with mock.patch("novel_generator.utils.multi_model_client.OPENAI_AVAILABLE", True), \
+                mock.patch.dict(client._CLIENT_CLASSES, {"deepseek": mock.Mock(return_value=backend)}):
+            assert client.switch_model("deepseek") is True
+        assert client._clients == {"deepseek": backend}
+
+    def test_switch_model_rejects_unknown_provider(self):
+        """Test that an unknown provider is reported without constructing clients"""
+        client = MultiModelClient({})
+
+        assert client.switch_model("unknown") is False
+        assert client._clients == {}
+
+
+class _Chunk:
+    """Minimal stand-in for a streamed chat completion chunk"""
+
+    def __init__(self, text):
+        self.usage = None
+        self.choices = [mock.Mock(delta=mock.Mock(content=text))]
+
+
+class TestStreamRetry:
+    """Test suite for retrying streams that break before the first chunk"""
+
+    def _make_client(self):
+        client = BaseModelClient({})
+        client.max_retries = 2
+        client.retry_delay = 1
+        client._apply_rate_limit = mock.Mock()
+        client.client = mock.Mock()
+        return client
+
+    def _broken_stream(self, *texts):
+        yield from (_Chunk(t) for t in texts)
+        raise ConnectionError("stream dropped")
+
+    @pytest.fixture(autouse=True)
+    def _transient_connection_errors(self):
+        with mock.patch(
+            "novel_generator.utils.multi_model_client._is_transient_stream_error",
+            side_effect=lambda e: isinstance(e, ConnectionError),
+        ), mock.patch("novel_generator.utils.multi_model_client.time.sleep") as sleep:
+            self.sleep = sleep
+            yield
+
+    def test_retries_until_stream_succeeds(self):
+        """Test that a stream dropped before any text is requested again"""
+        client = self._make_client()
+        create = mock.Mock(side_effect=[self._broken_stream(), iter([_Chunk("正文")])])
+        deltas = []
+
+        content, _ = client._stream_with_retry(create, deltas.append)
+
+        assert content == "正文"
+        assert deltas == ["正文"]
+        assert create.call_count == 2
+        assert self.sleep.call_count == 1
+        client._apply_rate_limit.assert_called_once()
+
+    def test_no_retry_after_text_received(self):
+        """Test that partial output is never re-requested"""
+        client = self._make_client()
+        create = mock.Mock(side_effect=lambda sdk_client: self._broken_stream("前半"))
+
+        with pytest.raises(ConnectionError):
+            client._stream_with_retry(create, lambda delta: None)
+        assert create.call_count == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test that retries stop after max_retries attempts"""
+        client = self._make_client()
+        create = mock.Mock(side_effect=lambda sdk_client: self._broken_stream())
+
+        with pytest.raises(ConnectionError):
+            client._stream_with_retry(create, lambda delta: None)
+        assert create.call_count == 3
+
+    def test_connect_errors_left_to_sdk(self):
+        """Test that failures raised by create() are not retried a second time"""
+        client = self._make_client()
+        create = mock.Mock(side_effect=ConnectionError("connect failed"))
+
+        with pytest.raises(ConnectionError):
+            client._stream_with_retry(create, lambda delta: None)
+        assert create.call_count == 1
+        assert self.sleep.call_count == 0
+
+    def test_stream_retries_bypass_sdk_retries(self):
+        """Test that re-sent requests use an SDK client with its own retries disabled"""
+        client = self._make_client()
+        create = mock.Mock(side_effect=[self._broken_stream(), iter([_Chunk("正文")])])
+
+        client._stream_with_retry(create, lambda delta: None)
+
+        assert create.call_args_list[0].args == (client.client,)
+        client.client.with_options.assert_called_once_with(max_retries=0)
+        assert create.call_args_list[1].args == (client.client.with_options.return_value,)